@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Замер загрузки страниц игр под разными сетевыми условиями
+Для каждой страницы и сетевого профиля (эмуляция через CDP) делает холодную
+загрузку (пустой кэш) и теплую (повторная загрузка в том же контексте) и
+меряет TTFB, First Contentful Paint, готовность Monaco и момент загрузки
+bugs-data.json (колонка data). Для холодной загрузки печатает самые долгие ресурсы —
+с них и стоит начинать сокращение.
+
+Потери пакетов в профиле lossy-wifi эмулируются не напрямую (packetLoss в CDP
+касается только WebRTC), а через их цену для TCP: меньшую полосу и большую
+задержку, см. with_loss.
+
+Профиль offline-after-load грузит страницу по сети, затем отключает сеть
+и проверяет, что игра запускается и раунд проходит без сети.
+
+Режим --menu меряет путь игрока: меню index.html → наведение на карточку →
+клик → игра готова (Monaco и данные загружены). Сравниваются меню с прогревом
+(prefetch/prerender) и без него (?noprefetch), каждый раз с пустым кэшем.
+Speculation rules работают только по HTTP(S): с --local (file://) прогревается
+лишь Monaco.
+"""
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from game_data import page_url
+from virtual_clock import with_virtual_time, advance, set_editor_value, ROUND_TRANSITION_MS
+
+PAGES = ["index.html", "bug-hunter.html", "speed-typing.html", "cloud-architect.html"]
+
+MBIT = 1024 * 1024 / 8  # байт/с в 1 Мбит/с
+
+TCP_MSS = 1460          # байт в сегменте
+TCP_MIN_RTO_MS = 200    # минимальный таймаут повторной передачи (Linux)
+
+
+def with_loss(latency: float, download: float, upload: float, loss: float) -> dict:
+    """Условия сети с потерей доли loss пакетов для загрузки по HTTP.
+
+    packetLoss в Network.emulateNetworkConditions действует только на WebRTC,
+    HTTP-запросы он не трогает. Для TCP потери видны как повторные передачи,
+    поэтому моделируем их следствия: пропускная способность ограничена
+    по формуле Матиса (MSS / RTT * sqrt(3/2 / p)), а задержка растет на
+    ожидаемое время повторной передачи запроса и первого сегмента ответа
+    (2 * p * RTO). Это средняя оценка: хвосты отдельных загрузок при
+    реальных потерях длиннее."""
+    cap = TCP_MSS / (latency / 1000) * (1.5 / loss) ** 0.5
+    return {
+        "latency": latency + 2 * loss * TCP_MIN_RTO_MS,
+        "downloadThroughput": min(download, cap),
+        "uploadThroughput": min(upload, cap),
+    }
+
+
+# Параметры Network.emulateNetworkConditions (latency в мс, пропускная способность в байт/с)
+NETWORK_PROFILES = {
+    "none": None,
+    "fast-3g": {"latency": 563, "downloadThroughput": 1.44 * MBIT, "uploadThroughput": 0.675 * MBIT},
+    "slow-4g": {"latency": 170, "downloadThroughput": 4 * MBIT, "uploadThroughput": 1.5 * MBIT},
+    # Wi-Fi 20/10 Мбит/с, RTT 40 мс и 5% потерь; потери переведены в задержку и полосу, см. with_loss
+    "lossy-wifi": with_loss(40, 20 * MBIT, 10 * MBIT, 0.05),
+    "offline-after-load": None,
+}
+
+# Метрики в мс от начала навигации; null — метрика неприменима к странице
+PAGE_TIMINGS_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const data = performance.getEntriesByType('resource').find(r => r.name.endsWith('/bugs-data.json'));
+    return {
+        ttfb: nav.responseStart,
+        fcp: fcp ? fcp.startTime : null,
+        load: nav.loadEventEnd,
+        bugsData: data ? data.responseEnd : null
+    };
+}"""
+
+SLOWEST_RESOURCES_JS = """n => performance.getEntriesByType('resource')
+    .map(r => ({ name: r.name.split('/').slice(-2).join('/'), ms: r.responseEnd - r.startTime, kb: r.transferSize / 1024 }))
+    .sort((a, b) => b.ms - a.ms)
+    .slice(0, n)"""
+
+# Возвращает performance.now() в момент готовности Monaco (страницы без редактора — сразу null)
+MONACO_READY_JS = """() => {
+    if (!document.getElementById('editor')) return { ready: null };
+    return typeof monaco !== 'undefined' && typeof editor !== 'undefined' && editor
+        ? { ready: performance.now() } : false;
+}"""
+
+# Игра готова к старту: то же условие, что в virtual_clock.wait_game_ready
+GAME_READY_JS = """() => typeof monaco !== 'undefined'
+    && typeof editor !== 'undefined' && !!editor
+    && Object.keys(bugScenariosByLanguage).length > 0
+    && (typeof snippetCorpus === 'undefined' || snippetCorpus.settled)"""
+
+# activationStart > 0 — страница была пререндерена и только показана по клику
+ACTIVATION_JS = "() => performance.getEntriesByType('navigation')[0].activationStart || 0"
+
+GAME_PAGES = ["speed-typing.html", "bug-hunter.html", "cloud-architect.html"]
+
+MENU_READ_MS = 1500   # игрок смотрит на меню до наведения
+MENU_HOVER_MS = 300   # наведение до клика (prerender с eagerness moderate стартует через 200 мс)
+
+METRICS = [("ttfb", "TTFB"), ("fcp", "FCP"), ("monaco", "Monaco"), ("bugsData", "data"), ("load", "load")]
+
+
+async def emulate(cdp, profile: str, offline: bool = False):
+    conditions = NETWORK_PROFILES[profile] or {"latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+    await cdp.send("Network.emulateNetworkConditions", {"offline": offline, **conditions})
+
+
+async def load_page(page, url: str) -> dict:
+    await page.goto(url, wait_until="load", timeout=180000)
+    ready = await page.wait_for_function(MONACO_READY_JS, polling="raf", timeout=180000)
+    timings = await page.evaluate(PAGE_TIMINGS_JS)
+    timings["monaco"] = (await ready.json_value())["ready"]
+    return timings
+
+
+async def check_offline_round(page, cdp) -> bool:
+    """После загрузки отключает сеть и проходит один раунд игры"""
+    start = page.locator("#startScreen .btn-primary")
+    if not await start.count():
+        return True  # меню: после загрузки сеть не нужна
+    await emulate(cdp, "offline-after-load", offline=True)
+    try:
+        await start.click()
+        if await page.evaluate("gameMode") == "architect":
+            return await page.evaluate("currentRound") == 1  # уровень архитектора ничего не грузит
+        await set_editor_value(page, await page.evaluate("currentTargetCode"))
+        await advance(page, ROUND_TRANSITION_MS)
+        return await page.evaluate("currentRound") == 2
+    except Exception as e:
+        print(f"  💥 Без сети: {e}")
+        return False
+    finally:
+        await emulate(cdp, "none")
+
+
+async def measure_page(browser, url: str, profile: str) -> dict:
+    """Холодная и теплая загрузка страницы в новом контексте браузера"""
+    context = await browser.new_context()
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    try:
+        await cdp.send("Network.enable")
+        await cdp.send("Network.clearBrowserCache")
+        await emulate(cdp, profile)
+
+        result = {"cold": await load_page(page, url)}
+        result["slowest"] = await page.evaluate(SLOWEST_RESOURCES_JS, 5)
+        result["warm"] = await load_page(page, url)
+        if profile == "offline-after-load":
+            result["offline_ok"] = await check_offline_round(page, cdp)
+        return result
+    finally:
+        await context.close()
+
+
+async def measure_menu_click(browser, local: bool, game: str, prefetch: bool, profile: str) -> dict:
+    """Время от клика по карточке в меню до готовой к старту игры"""
+    context = await browser.new_context()
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    try:
+        await cdp.send("Network.enable")
+        await cdp.send("Network.clearBrowserCache")
+        await emulate(cdp, profile)
+        menu_url = page_url("index.html", local) + ("" if prefetch else "?noprefetch")
+        await page.goto(menu_url, wait_until="load", timeout=180000)
+        await page.wait_for_timeout(MENU_READ_MS)
+
+        card = page.locator(f'a.game-card[href="{game}"]')
+        await card.hover()
+        await page.wait_for_timeout(MENU_HOVER_MS)
+        started = time.perf_counter()
+        await card.click()
+        await page.wait_for_url(f"**/{game}*", timeout=180000)
+        await page.wait_for_function(GAME_READY_JS, polling="raf", timeout=180000)
+        playable = (time.perf_counter() - started) * 1000
+        return {"playable": playable, "prerendered": await page.evaluate(ACTIVATION_JS) > 0}
+    finally:
+        await context.close()
+
+
+async def bench_menu(browser, runs: int, local: bool, profile: str):
+    print(f"\n📶 Профиль сети: {profile}")
+    print(f"  {'игра':22} {'без прогрева':>13} {'с прогревом':>12}  prerender")
+    for game in GAME_PAGES:
+        cold = [await measure_menu_click(browser, local, game, False, profile) for _ in range(runs)]
+        warm = [await measure_menu_click(browser, local, game, True, profile) for _ in range(runs)]
+        before = statistics.median(s["playable"] for s in cold)
+        after = statistics.median(s["playable"] for s in warm)
+        prerendered = sum(s["prerendered"] for s in warm)
+        print(f"  {game:22} {before:10.0f} мс {after:9.0f} мс  {prerendered}/{runs}")
+
+
+def format_ms(value) -> str:
+    return f"{value:7.0f}" if value is not None else "      —"
+
+
+def median_of(samples, cache: str, key: str):
+    values = [s[cache][key] for s in samples if s[cache][key] is not None]
+    return statistics.median(values) if values else None
+
+
+async def main(runs: int = 3, local: bool = False, profiles=None, menu: bool = False):
+    profiles = profiles or ["none"]
+    if menu:
+        print(f"⏱️  Клик в меню → игра готова ({'локально' if local else 'прод'}, прогонов: {runs}, медиана)")
+    else:
+        print(f"⏱️  Загрузка страниц ({'локально' if local else 'прод'}, прогонов: {runs}, мс от начала навигации)")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for profile in profiles:
+                if menu:
+                    await bench_menu(browser, runs, local, profile)
+                    continue
+                print(f"\n📶 Профиль сети: {profile}")
+                print(f"  {'страница':22} {'кэш':5} " + " ".join(f"{label:>7}" for _, label in METRICS))
+                for name in PAGES:
+                    url = with_virtual_time(page_url(name, local))
+                    samples = [await measure_page(browser, url, profile) for _ in range(runs)]
+                    for cache in ("cold", "warm"):
+                        row = " ".join(format_ms(median_of(samples, cache, key)) for key, _ in METRICS)
+                        print(f"  {name if cache == 'cold' else '':22} {cache:5} {row}")
+                    slowest = ", ".join(f"{r['name']} {r['ms']:.0f} мс/{r['kb']:.0f} KB" for r in samples[0]["slowest"][:3])
+                    print(f"  {'':22} самые долгие: {slowest}")
+                    if profile == "offline-after-load":
+                        ok = all(s["offline_ok"] for s in samples)
+                        print(f"  {'':22} {'✅' if ok else '❌'} без сети после загрузки игра {'работает' if ok else 'не работает'}")
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
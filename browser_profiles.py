@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Профили запуска браузера для ботов и тестов
+  fast — headless, небольшой viewport, prefers-reduced-motion (страницы игр
+         обнуляют CSS-анимации и переходы и не трясут редактор), картинки,
+         видео и шрифты блокируются на уровне route. Для функциональных
+         проверок и CI: раунды, подсчет очков, переходы.
+  full — все ресурсы и анимации как у игрока. Для визуальных тестов и скриншотов.
+         Запускается в новом headless-режиме Chrome (--headless=new): это тот же
+         браузер, что и с окном, с тем же композитором и отрисовкой, а не
+         отдельная headless-оболочка Playwright по умолчанию. GPU при этом
+         программный (SwiftShader), не как у киоска; проблемы, зависящие от
+         видеокарты, видны только с окном (headless=False).
+
+Каждый скрипт выбирает профиль под свою проверку; `python -m cli ... --browser
+fast|full` переопределяет выбор для всего запуска (select()).
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page, Playwright
+
+# Ресурсы, которые не влияют на логику игр (Monaco, данные и стили грузятся всегда)
+BLOCKED_RESOURCES = "**/*.{png,jpg,jpeg,gif,webp,ico,mp4,webm,woff,woff2}"
+
+BROWSER_PROFILES = {
+    "fast": {
+        "headless": True,
+        "viewport": {"width": 1024, "height": 720},
+        "reduced_motion": "reduce",
+        "block": True,
+        "new_headless": False,
+        # фоновые сервисы Chromium, которые тестам не нужны
+        "args": ["--disable-extensions", "--disable-background-networking", "--mute-audio"],
+    },
+    "full": {
+        "headless": True,
+        "viewport": {"width": 1280, "height": 720},
+        "reduced_motion": "no-preference",
+        "block": False,
+        "new_headless": True,
+        "args": [],
+    },
+}
+
+_override = None
+
+
+def select(name: str | None):
+    """Профиль для всех запусков в этом процессе (None — выбор скриптов)"""
+    global _override
+    if name is not None and name not in BROWSER_PROFILES:
+        raise ValueError(f"unknown browser profile: {name!r}")
+    _override = name
+
+
+def resolve(profile: str) -> str:
+    return _override or profile
+
+
+async def launch(playwright: Playwright, profile: str, headless: bool = None) -> Browser:
+    """Chromium под профиль; headless=False — окно для ручного наблюдения
+    за прогоном (профиль, выбранный через select(), его отменяет)"""
+    settings = BROWSER_PROFILES[resolve(profile)]
+    headless = settings["headless"] if headless is None or _override else headless
+    args = settings["args"]
+    if headless and settings["new_headless"]:
+        # headless=True в Playwright — старая headless-оболочка; новый режим включается флагом
+        headless, args = False, [*args, "--headless=new"]
+    return await playwright.chromium.launch(headless=headless, args=args)
+
+
+async def new_page(browser: Browser, profile: str) -> Page:
+    """Страница в отдельном контексте с настройками профиля"""
+    settings = BROWSER_PROFILES[resolve(profile)]
+    context = await browser.new_context(
+        viewport=settings["viewport"],
+        reduced_motion=settings["reduced_motion"],
+    )
+    if settings["block"]:
+        await context.route(BLOCKED_RESOURCES, lambda route: route.abort())
+    return await context.new_page()
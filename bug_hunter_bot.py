@@ -2,12 +2,41 @@
 """
 Bug Hunter Bot - Автоматическое прохождение игры "КОД-ХАНТИНГ"
 Использует Playwright для автоматизации решения багов
+
+Режим soak (python -m cli play --soak 3000): тысячи раундов во всех трёх
+играх без перезагрузки страницы (finish → backToMenu → новая игра) в
+виртуальном времени, с замерами памяти и поиском утечек (soak_monitor.py).
 """
 
 import asyncio
 import json
 from playwright.async_api import async_playwright, Page
-from datetime import datetime
+
+from browser_profiles import launch, new_page
+from screenshot_store import ScreenshotStore
+from round_profiler import RoundProfiler, profile_round
+from soak_monitor import LeakMonitor
+from virtual_clock import (
+    with_virtual_time, wait_game_ready, advance, set_editor_value,
+    ROUND_TRANSITION_MS, ARCHITECT_AUTO_ADVANCE_MS,
+)
+
+SOAK_LANGUAGES = ["javascript", "python", "cpp", "csharp", "java", "golang"]
+SOAK_ROUNDS_PER_GAME = 10       # раундов в одной игре до finish/backToMenu (архитектор — все 7 уровней)
+SOAK_GAMES_PER_SEGMENT = 40     # игр подряд на одной загрузке страницы
+ARCHITECT_BONUS_DELAY_MS = 2500  # architectLevelComplete() -> showBonusStage()
+ARCHITECT_SKIP_DELAY_MS = 1500   # skipBonus() -> proceedToNextLevel()
+
+# Собирает текущий уровень архитектора так же, как игрок: блоки и клики по парам блоков
+SOLVE_ARCHITECT_LEVEL_JS = """() => {
+    const level = architectureLevels[currentRound - 1];
+    level.requiredBlocks.forEach((type, i) => addBlockToCanvas(type, 40 + (i % 4) * 170, 40 + Math.floor(i / 4) * 140));
+    const idOf = type => droppedBlocks.find(b => b.type === type).id;
+    level.requiredConnections.forEach(c => {
+        handleBlockClick(idOf(c.from), c.from);
+        handleBlockClick(idOf(c.to), c.to);
+    });
+}"""
 
 
 # Словарь решений для Python багов
@@ -54,17 +83,22 @@ new_state = add_user({'id': 1})"""
 
 
 class BugHunterBot:
-    def __init__(self, url: str, language: str = "python"):
+    def __init__(self, url: str, language: str = "python", profile: bool = False):
         self.url = url
+        self.profile = profile
+        self.profiler = None
         self.language = language
         self.rounds_completed = 0
         self.drink_unlocked = False
+        self.screenshots = ScreenshotStore()
 
     async def run(self):
         """Основной метод запуска бота"""
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
+            browser = await launch(p, "fast")
+            page = await new_page(browser, "fast")
+            if self.profile:
+                self.profiler = RoundProfiler(page)
 
             try:
                 print(f"🤖 Bug Hunter Bot запущен")
@@ -79,21 +113,24 @@ class BugHunterBot:
                 # Играем минимум 3 раунда
                 min_rounds = 3
                 while self.rounds_completed < min_rounds:
-                    success = await self.play_round(page)
+                    async with profile_round(self.profiler, f"round{self.rounds_completed + 1:02d}"):
+                        success = await self.play_round(page)
+                        if success:
+                            # Ждем загрузки следующего раунда
+                            await asyncio.sleep(2.5)
                     if not success:
                         print(f"❌ Ошибка в раунде {self.rounds_completed + 1}")
                         break
 
-                    # Ждем загрузки следующего раунда
-                    await asyncio.sleep(2.5)
+                if self.profiler:
+                    self.profiler.write_summary()
 
                 # Проверяем результат
                 await self.check_final_screen(page)
 
                 # Делаем финальный скриншот
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                await page.screenshot(path=f"bug_hunter_result_{timestamp}.png")
-                print(f"📸 Скриншот сохранен: bug_hunter_result_{timestamp}.png")
+                sha = self.screenshots.save("bug_hunter_result", await page.screenshot())
+                print(f"📸 Скриншот сохранен: bug_hunter_result ({sha[:12]})")
 
                 # Держим браузер открытым для просмотра
                 print("\n✅ Игра завершена! Проверьте результат в браузере.")
@@ -101,11 +138,112 @@ class BugHunterBot:
 
             except Exception as e:
                 print(f"💥 Ошибка: {e}")
-                await page.screenshot(path=f"error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+                self.screenshots.save("bug_hunter_error", await page.screenshot())
                 raise
             finally:
                 await browser.close()
 
+    async def soak(self, total_rounds: int = 3000, report_path: str = "soak_report.json") -> bool:
+        """Длительный прогон всех трёх игр с поиском утечек памяти
+
+        Каждая страница открывается один раз на сегмент из SOAK_GAMES_PER_SEGMENT игр,
+        между играми — showFinalScreen() и backToMenu(), как у киоска на стенде.
+        Замер делается после каждой игры, в одинаковом состоянии (стартовый экран).
+        В конце сегмента вызывается restartGame() (перезагрузка страницы).
+        """
+        base_url = self.url.rsplit("/", 1)[0]
+        games = [
+            ("bug-hunter.html", "startBugHuntingGame", self.soak_bug_round),
+            ("speed-typing.html", "startTypingGame", self.soak_typing_round),
+            ("cloud-architect.html", "startArchitectGame", self.soak_architect_round),
+        ]
+
+        async with async_playwright() as p:
+            browser = await launch(p, "fast")
+            page = await new_page(browser, "fast")
+            page.on("dialog", lambda dialog: asyncio.create_task(dialog.accept()))
+            monitor = LeakMonitor(page)
+            await monitor.attach()
+            if self.profile:
+                self.profiler = RoundProfiler(page)
+
+            rounds = 0
+            segment = 0
+            try:
+                while rounds < total_rounds:
+                    page_name, start_function, play = games[segment % len(games)]
+                    segment += 1
+                    print(f"\n🔁 Сегмент {segment}: {page_name} (сыграно раундов: {rounds})")
+                    await page.goto(with_virtual_time(f"{base_url}/{page_name}"))
+                    await wait_game_ready(page)
+                    monitor.start_segment(f"{segment}. {page_name}")
+                    await monitor.sample(rounds)
+
+                    for game in range(SOAK_GAMES_PER_SEGMENT):
+                        if rounds >= total_rounds:
+                            break
+                        language = SOAK_LANGUAGES[game % len(SOAK_LANGUAGES)]
+                        if await page.is_visible("#languageSelector"):
+                            await page.select_option("#languageSelector", value=language)
+                        await page.evaluate(f"{start_function}()")
+
+                        # Профилируем только первую игру сегмента, иначе профилей будут тысячи
+                        profiler = self.profiler if game == 0 else None
+                        for _ in range(SOAK_ROUNDS_PER_GAME):
+                            async with profile_round(profiler, f"{segment:02d}_{page_name[:-5]}_{rounds + 1:05d}"):
+                                played = await play(page)
+                            if not played:
+                                break
+                            rounds += 1
+
+                        await page.evaluate("""() => {
+                            if (!document.getElementById('finalScreen').classList.contains('show')) showFinalScreen();
+                            backToMenu();
+                        }""")
+                        sample = await monitor.sample(rounds)
+                        print(f"  игра {game + 1}: heap {sample['heap']} KB, узлов {sample['nodes']}, "
+                              f"обработчиков {sample['listeners']}, моделей {sample['models']}, таймеров {sample['timers']}")
+
+                    # Начать заново перезагружает страницу — проверяем, что после этого игра поднимается
+                    async with page.expect_navigation():
+                        await page.evaluate("restartGame()")
+                    await wait_game_ready(page)
+            finally:
+                await browser.close()
+
+        if self.profiler:
+            self.profiler.write_summary()
+        results = monitor.analyze()
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"rounds": rounds, "segments": monitor.segments, "trends": results}, f, indent=2, ensure_ascii=False)
+        print(f"📄 Замеры сохранены в {report_path}")
+        return monitor.print_report(results)
+
+    async def soak_bug_round(self, page: Page) -> bool:
+        """Раунд код-хантинга: вставляем fixedCode текущего сценария"""
+        round_before = await page.evaluate("currentRound")
+        await set_editor_value(page, await page.evaluate("currentTargetCode"))
+        await advance(page, ROUND_TRANSITION_MS)
+        return await page.evaluate("currentRound") > round_before
+
+    async def soak_typing_round(self, page: Page) -> bool:
+        """Раунд скоростного набора: вставляем целевой код"""
+        round_before = await page.evaluate("currentRound")
+        await page.evaluate("editor.getModel().setValue(currentTargetCode)")
+        await advance(page, ROUND_TRANSITION_MS)
+        return await page.evaluate("currentRound") > round_before
+
+    async def soak_architect_round(self, page: Page) -> bool:
+        """Уровень архитектора: собираем схему, пропускаем бонус-конфиг"""
+        if await page.evaluate("currentRound") >= 7 or await page.is_visible("#finalScreen.show"):
+            return False
+        round_before = await page.evaluate("currentRound")
+        await page.evaluate(SOLVE_ARCHITECT_LEVEL_JS)
+        await advance(page, ARCHITECT_AUTO_ADVANCE_MS + ARCHITECT_BONUS_DELAY_MS)
+        await page.evaluate("skipBonus()")
+        await advance(page, ARCHITECT_SKIP_DELAY_MS)
+        return await page.evaluate("currentRound") > round_before or await page.is_visible("#finalScreen.show")
+
     async def start_game(self, page: Page):
         """Начинает игру - выбирает язык и кликает Start"""
         print(f"\n🎮 Начинаем игру")
@@ -154,7 +292,7 @@ class BugHunterBot:
             escaped_code = fixed_code.replace('`', '\\`').replace('${', '\\${')
 
             await page.evaluate(f"""
-                monaco.editor.getModels()[0].setValue(`{escaped_code}`);
+                editor.getModel().setValue(`{escaped_code}`);
             """)
 
             print(f"📝 Код установлен в редактор")
@@ -182,7 +320,7 @@ class BugHunterBot:
 
         except Exception as e:
             print(f"💥 Ошибка в раунде: {e}")
-            await page.screenshot(path=f"round_{self.rounds_completed + 1}_error.png")
+            self.screenshots.save(f"round_{self.rounds_completed + 1}_error", await page.screenshot())
             return False
 
     async def check_final_screen(self, page: Page):
@@ -229,10 +367,12 @@ class BugHunterBot:
             print(f"⚠️  Не удалось прочитать финальный экран: {e}")
 
 
-async def main():
+async def main(url: str = "https://mws-code-game.website.yandexcloud.net/bug-hunter.html",
+               soak_rounds: int = 0, profile: bool = False):
     """Точка входа"""
-    url = "https://mws-code-game.website.yandexcloud.net/bug-hunter.html"
-    bot = BugHunterBot(url, language="python")
+    bot = BugHunterBot(url, language="python", profile=profile)
+    if soak_rounds:
+        return await bot.soak(soak_rounds)
     await bot.run()
 
 
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Сборка шрифтов MTS: сабсеты Latin + Cyrillic и preload в страницах игр
+1. Собирает символы, которые реально встречаются в страницах и bugs-data.json
+2. Режет каждый woff2 из fonts/ на два сабсета (latin / cyrillic) через fontTools
+3. Переписывает @font-face в страницах (unicode-range + font-display)
+   и вставляет <link rel="preload"> для сабсетов, которые использует страница
+Скрипт идемпотентен: повторный запуск пересобирает те же файлы и блоки.
+
+Зависимости: pip install fonttools brotli
+"""
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+FONTS_DIR = ROOT / "fonts"
+
+PAGES = ["index.html", "speed-typing.html", "bug-hunter.html", "cloud-architect.html"]
+TEXT_SOURCES = PAGES + ["bugs-data.json"]
+
+# (family, weight, исходный файл)
+FACES = [
+    ("MTS Compact", 400, "MTSCompact-Regular"),
+    ("MTS Compact", 500, "MTSCompact-Medium"),
+    ("MTS Text", 400, "MTSText-Regular"),
+    ("MTS Wide", 500, "MTSWide-Medium"),
+]
+
+# Диапазоны как у Google Fonts для сабсетов latin и cyrillic
+SUBSETS = {
+    "latin": [
+        (0x0000, 0x00FF), (0x0131, 0x0131), (0x0152, 0x0153), (0x02BB, 0x02BC),
+        (0x02C6, 0x02C6), (0x02DA, 0x02DA), (0x02DC, 0x02DC), (0x2000, 0x206F),
+        (0x2074, 0x2074), (0x20AC, 0x20AC), (0x2122, 0x2122), (0x2191, 0x2191),
+        (0x2193, 0x2193), (0x2212, 0x2212), (0x2215, 0x2215), (0xFEFF, 0xFEFF),
+        (0xFFFD, 0xFFFD),
+    ],
+    "cyrillic": [
+        (0x0301, 0x0301), (0x0400, 0x045F), (0x0490, 0x0491), (0x04B0, 0x04B1),
+        (0x2116, 0x2116),
+    ],
+}
+
+# optional + preload: шрифт из preload успевает к первому кадру, а если нет —
+# страница остаётся на системном шрифте без видимой подмены
+FONT_DISPLAY = "optional"
+
+# Preload только для основного текста над сгибом (body: 'MTS Text' 400, латиница).
+# Остальные сабсеты грузятся по unicode-range по мере надобности: с optional
+# незагрузившийся вовремя шрифт все равно не подменяется, а лишний preload
+# отнимает полосу у Monaco и данных игры
+PRELOAD = [("MTSText-Regular", "latin")]
+
+FONT_FACE_BLOCK = re.compile(r"( *)/\* MTS Fonts[^\n]*\*/\n(?:\s*@font-face \{[^}]*\}\n)+")
+PRELOAD_LINK = re.compile(r' *<link rel="preload" href="fonts/[^"]+" as="font"[^>]*>\n')
+ICON_LINK = re.compile(r'( *)<link rel="icon"[^>]*>\n')
+
+
+def subset_file_name(source: str, subset: str) -> str:
+    return f"{source}.{subset}.woff2"
+
+
+def in_ranges(codepoint: int, ranges) -> bool:
+    return any(start <= codepoint <= end for start, end in ranges)
+
+
+def collect_codepoints():
+    """Все символы из страниц и данных игры, разложенные по сабсетам"""
+    used = set(range(0x20, 0x7F))  # печатный ASCII нужен всегда
+    for name in TEXT_SOURCES:
+        used.update(ord(ch) for ch in (ROOT / name).read_text(encoding="utf-8"))
+
+    return {
+        subset: sorted(cp for cp in used if in_ranges(cp, ranges))
+        for subset, ranges in SUBSETS.items()
+    }
+
+
+def build_subsets(codepoints_by_subset):
+    """Режет исходные woff2 на сабсеты, возвращает {имя файла: размер}"""
+    try:
+        from fontTools import subset as ft_subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        sys.exit("❌ Нужен fontTools: pip install fonttools brotli")
+
+    sizes = {}
+    for _, _, source in FACES:
+        for subset, codepoints in codepoints_by_subset.items():
+            options = ft_subset.Options()
+            options.flavor = "woff2"
+            options.notdef_outline = True
+            options.drop_tables += ["meta"]
+            # байт-в-байт одинаковый результат при повторной сборке
+            options.recalc_timestamp = False
+
+            font = TTFont(FONTS_DIR / f"{source}.woff2", recalcTimestamp=False)
+            modified = font["head"].modified
+            subsetter = ft_subset.Subsetter(options=options)
+            subsetter.populate(unicodes=codepoints)
+            subsetter.subset(font)
+            font["head"].modified = modified  # дата исходного шрифта, а не время сборки
+
+            out_name = subset_file_name(source, subset)
+            ft_subset.save_font(font, FONTS_DIR / out_name, options)
+            sizes[out_name] = (FONTS_DIR / out_name).stat().st_size
+    return sizes
+
+
+def format_unicode_range(ranges) -> str:
+    return ", ".join(
+        f"U+{start:04X}" if start == end else f"U+{start:04X}-{end:04X}"
+        for start, end in ranges
+    )
+
+
+def render_font_faces(indent: str) -> str:
+    lines = [f"{indent}/* MTS Fonts (Latin + Cyrillic subsets, generated by build_fonts.py) */"]
+    for family, weight, source in FACES:
+        for subset, ranges in SUBSETS.items():
+            lines += [
+                f"{indent}@font-face {{",
+                f"{indent}    font-family: '{family}';",
+                f"{indent}    src: url('fonts/{subset_file_name(source, subset)}') format('woff2');",
+                f"{indent}    font-weight: {weight};",
+                f"{indent}    font-style: normal;",
+                f"{indent}    font-display: {FONT_DISPLAY};",
+                f"{indent}    unicode-range: {format_unicode_range(ranges)};",
+                f"{indent}}}",
+                "",
+            ]
+    return "\n".join(lines)
+
+
+def used_faces(content: str):
+    """Начертания, на которые ссылается CSS страницы (вне @font-face)"""
+    css = FONT_FACE_BLOCK.sub("", content)
+    return [
+        (family, weight, source) for family, weight, source in FACES
+        if f"'{family}'" in css
+    ]
+
+
+def patch_page(name: str) -> bool:
+    path = ROOT / name
+    content = path.read_text(encoding="utf-8")
+
+    match = FONT_FACE_BLOCK.search(content)
+    if not match:
+        print(f"  ⚠️  {name}: блок @font-face не найден, пропускаем")
+        return False
+    new_content = content[:match.start()] + render_font_faces(match.group(1)) + content[match.end():]
+
+    new_content = PRELOAD_LINK.sub("", new_content)
+    icon = ICON_LINK.search(new_content)
+    indent = icon.group(1)
+    preload = "".join(
+        f'{indent}<link rel="preload" href="fonts/{subset_file_name(source, subset)}" '
+        f'as="font" type="font/woff2" crossorigin>\n'
+        for _, _, source in used_faces(new_content)
+        for preload_source, subset in PRELOAD
+        if source == preload_source
+    )
+    new_content = new_content[:icon.end()] + preload + new_content[icon.end():]
+
+    if new_content == content:
+        return False
+    path.write_text(new_content, encoding="utf-8")
+    return True
+
+
+def main():
+    print("🔤 Собираем символы из страниц и bugs-data.json...")
+    codepoints = collect_codepoints()
+    for subset, cps in codepoints.items():
+        print(f"  {subset}: {len(cps)} символов")
+
+    print("\n✂️  Режем шрифты на сабсеты...")
+    sizes = build_subsets(codepoints)
+    total_before = sum((FONTS_DIR / f"{source}.woff2").stat().st_size for _, _, source in FACES)
+    for out_name, size in sizes.items():
+        print(f"  {out_name}: {size / 1024:.1f} KB")
+    print(f"  Итого: {total_before / 1024:.1f} KB → {sum(sizes.values()) / 1024:.1f} KB")
+
+    print("\n📝 Обновляем @font-face и preload в страницах...")
+    for name in PAGES:
+        changed = patch_page(name)
+        print(f"  {'✅' if changed else '—'} {name}")
+
+    print("\n✅ Шрифты собраны")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Сборка корпуса сниппетов для Speed Typing из локальных исходников
+Встроенных codeSnippets в speed-typing.html мало, постоянные игроки их
+запоминают. Скрипт проходит по деревьям исходников, вырезает законченные
+фрагменты кода нужной длины и пишет шарды snippets/javascript-NNN.json и
+snippets/index.json, которые страница подгружает лениво. Редактор Speed Typing
+всегда в javascript, поэтому корпус собирается только из исходников на JS.
+
+Конвейер из генераторов, в памяти одновременно один файл построчно
+(не больше MAX_LINES + 1 строк) и выборка:
+  1. файлы .js/.mjs/.cjs/.jsx (служебные каталоги, минифицированные и слишком
+     большие файлы пропускаются)
+  2. законченные фрагменты: скобки сбалансированы, следующая строка не
+     продолжает конструкцию (отступ не глубже первой строки, не else/catch/...),
+     без пустых строк внутри; фрагмент не начинается и не заканчивается внутри
+     docstring, /* ... */ или многострочного шаблона `...`
+  3. фильтры под набор с клавиатуры: ASCII, длина строк, не одни комментарии,
+     хотя бы один токен кода ( ( = : ; { )
+  4. дедупликация и выборка по нормализованному хешу (bottom-k): хранятся LIMIT фрагментов с наименьшим blake2b от текста без пробелов.
+     Один и тот же фрагмент всегда дает один хеш, поэтому дубли не проходят,
+     а выборка равномерна по уникальным фрагментам при любом размере дерева
+  5. сложность одним векторным проходом (numpy): плотность символов, число
+     строк, глубина отступов, длина; ранг внутри корпуса -> шкала 1..5 с шагом 0.5,
+     как у встроенных сниппетов
+
+    python3 build_snippets.py ~/src/react ~/src/express
+    python3 build_snippets.py ~/src --limit 5000 --shard-size 200 --out snippets
+
+Корпус в snippets/ закоммичен и выкладывается как есть (CI его не собирает:
+нужны исходники). Текущий собран из исходников npm 10.8.2, который идет
+с Node.js 20.19.5:
+
+    python3 build_snippets.py /usr/lib/node_modules/npm
+
+Повторная сборка из тех же исходников дает те же файлы байт в байт.
+
+Зависимости: pip install numpy
+"""
+import argparse
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import string
+import sys
+from collections import deque
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+OUT_DIR = ROOT / "snippets"
+
+# id языка в Monaco: страница ищет шарды по языку редактора
+LANGUAGE = "javascript"
+EXTENSIONS = (".js", ".mjs", ".cjs", ".jsx")
+
+SKIP_DIRS = {"node_modules", "vendor", "dist", "build", "out", "target", "third_party",
+             "__pycache__", "venv", "site-packages", "coverage"}
+SKIP_SUFFIXES = (".min.js", ".bundle.js")
+MAX_FILE_BYTES = 512 * 1024    # больше — почти всегда сгенерированный код
+
+MIN_LINES, MAX_LINES = 2, 7
+MIN_CHARS, MAX_CHARS = 40, 240
+MAX_LINE_CHARS = 60            # строка целиком видна в редакторе на телефоне
+MAX_TOKEN_CHARS = 32           # длинные литералы, хеши, base64 — не для набора
+LIMIT = 2000                   # сниппетов в корпусе
+SHARD_SIZE = 200               # не больше сниппетов в шарде (страница грузит один шард за игру)
+INDENT = 2                     # пробелов на уровень в корпусе, как во встроенных сниппетах
+
+OPENERS, CLOSERS = "([{", ")]}"
+COMMENT_PREFIXES = ("//", "/*", "*")
+CODE_TOKENS = "(=:;{"          # без них во фрагменте проза, а не код
+
+# многострочные блоки (открывающий -> закрывающий) и строчный комментарий
+BLOCKS = {"/*": "*/", "`": "`"}
+LINE_COMMENT = "//"
+# строка продолжает предыдущую конструкцию: фрагмент перед ней не закончен
+CONTINUATIONS = ("else", "finally", "catch", ".", "?", ":", "&&", "||", "+", "-")
+
+# веса признаков сложности (после нормировки по корпусу)
+DIFFICULTY_WEIGHTS = {"symbols": 0.4, "lines": 0.2, "indent": 0.2, "chars": 0.2}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        sys.exit("❌ Нужен numpy: pip install numpy")
+    return np
+
+
+# ---------- 1. файлы ----------
+
+def iter_source_files(roots):
+    """Исходники на JS в деревьях roots, без служебных каталогов"""
+    for root in roots:
+        for directory, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+            for name in sorted(files):
+                if not name.endswith(EXTENSIONS) or name.endswith(SKIP_SUFFIXES):
+                    continue
+                path = Path(directory, name)
+                try:
+                    if path.stat().st_size <= MAX_FILE_BYTES:
+                        yield path
+                except OSError:
+                    continue
+
+
+def iter_lines(path: Path):
+    """Строки файла без перевода строки и хвостовых пробелов, табы -> 4 пробела"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip().expandtabs(4)
+    except (UnicodeDecodeError, OSError):
+        return
+
+
+# ---------- 2. законченные фрагменты ----------
+
+def scan_blocks(line: str, opened):
+    """Незакрытый многострочный блок после строки (его закрывающий разделитель или None).
+    Однострочные строки и строчные комментарии пропускаются, чтобы кавычки и
+    разделители внутри них не открывали блок"""
+    i = 0
+    while i < len(line):
+        if opened:
+            end = line.find(opened, i)
+            if end < 0:
+                return opened
+            i, opened = end + len(opened), None
+            continue
+        if line.startswith(LINE_COMMENT, i):
+            return None
+        start = next((start for start in BLOCKS if line.startswith(start, i)), None)
+        if start:
+            i, opened = i + len(start), BLOCKS[start]
+        elif line[i] in "\"'":
+            # строка до закрывающей кавычки с учетом экранирования
+            quote, i = line[i], i + 1
+            while i < len(line) and line[i] != quote:
+                i += 2 if line[i] == "\\" else 1
+            i += 1
+        else:
+            i += 1
+    return opened
+
+
+def iter_scanned(lines):
+    """(строка, блок открыт до строки, блок открыт после строки)"""
+    opened = None
+    for line in lines:
+        before, opened = opened, scan_blocks(line, opened)
+        yield line, before, opened
+
+
+def indent_of(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def bracket_depth(line: str, depth: int) -> int:
+    """Глубина скобок после строки; строковые литералы не разбираются — редкие
+    скобки в строках дают несбалансированный фрагмент, и он отбрасывается"""
+    for char in line:
+        if char in OPENERS:
+            depth += 1
+        elif char in CLOSERS:
+            depth -= 1
+            if depth < 0:
+                return depth
+    return depth
+
+
+def unit_length(buffer: deque) -> int:
+    """Сколько строк с начала буфера образуют законченный фрагмент (0 — нет такого);
+    элементы буфера — (строка, блок открыт до, блок открыт после) из iter_scanned"""
+    first_line, inside, _ = buffer[0]
+    first = first_line.lstrip()
+    if inside or not first or first[0] in CLOSERS or first.startswith(CONTINUATIONS):
+        return 0
+    base = indent_of(first_line)
+    depth = 0
+    for n, (line, _, opened) in enumerate(itertools.islice(buffer, MAX_LINES), 1):
+        if not line.strip() or indent_of(line) < base:
+            return 0
+        depth = bracket_depth(line, depth)
+        if depth < 0:
+            return 0
+        if depth or opened or n < MIN_LINES or line.endswith(("\\", ",", ":", "=", "(", "+", "&&", "||")):
+            continue
+        if n == len(buffer):
+            return n  # конец файла
+        following = buffer[n][0]
+        if not following.strip():
+            return n
+        if indent_of(following) <= base and not following.lstrip().startswith((*CONTINUATIONS, *CLOSERS)):
+            return n
+    return 0
+
+
+def iter_units(scanned):
+    """Законченные фрагменты файла без перекрытий; в буфере не больше MAX_LINES + 1 строк"""
+    buffer = deque()
+    source = iter(scanned)
+    exhausted = False
+    while True:
+        while not exhausted and len(buffer) <= MAX_LINES:
+            item = next(source, None)
+            if item is None:
+                exhausted = True
+            else:
+                buffer.append(item)
+        if not buffer:
+            return
+        length = unit_length(buffer)
+        if length:
+            unit = [buffer.popleft()[0] for _ in range(length)]
+            base = indent_of(unit[0])
+            yield [line[base:] for line in unit]
+        else:
+            buffer.popleft()
+
+
+# ---------- 3. фильтры ----------
+
+def reindent(lines) -> str:
+    """Отступы кратные 4 (или 8) -> по INDENT пробелов на уровень"""
+    step = min((indent_of(line) for line in lines if indent_of(line)), default=INDENT)
+    if step not in (2, 4, 8):
+        return "\n".join(lines)  # выравнивание, а не уровни вложенности
+    return "\n".join(" " * (indent_of(line) // step * INDENT) + line.lstrip(" ") for line in lines)
+
+
+def is_typeable(code: str) -> bool:
+    if not (MIN_CHARS <= len(code) <= MAX_CHARS) or not code.isascii():
+        return False
+    lines = code.split("\n")
+    if any(len(line) > MAX_LINE_CHARS for line in lines):
+        return False
+    if any(len(token) > MAX_TOKEN_CHARS for token in code.split()):
+        return False
+    code_lines = [line for line in lines if not line.lstrip().startswith(COMMENT_PREFIXES)]
+    if len(code_lines) * 2 < len(lines):
+        return False
+    return any(token in line for line in code_lines for token in CODE_TOKENS)
+
+
+def iter_snippets(files):
+    """Код всех подходящих фрагментов из потока файлов"""
+    for path in files:
+        for unit in iter_units(iter_scanned(iter_lines(path))):
+            code = reindent(unit)
+            if is_typeable(code):
+                yield code
+
+
+# ---------- 4. дедупликация и выборка ----------
+
+def normalized_hash(code: str) -> int:
+    """64-битный хеш текста без пробельных символов: переформатированный фрагмент — тот же"""
+    digest = hashlib.blake2b("".join(code.split()).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class BottomK:
+    """K уникальных фрагментов с наименьшими хешами; память O(K) при любом потоке"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.heap = []          # max-heap по хешу: [(-hash, code)]
+        self.kept = set()       # хеши в выборке
+        self.seen = 0
+        self.duplicates = 0
+
+    def offer(self, code: str):
+        self.seen += 1
+        h = normalized_hash(code)
+        if h in self.kept:
+            self.duplicates += 1
+        elif len(self.heap) < self.k:
+            heapq.heappush(self.heap, (-h, code))
+            self.kept.add(h)
+        elif h < -self.heap[0][0]:
+            removed, _ = heapq.heapreplace(self.heap, (-h, code))
+            self.kept.discard(-removed)
+            self.kept.add(h)
+
+    def snippets(self):
+        """Выборка в порядке хеша — псевдослучайном, но одинаковом между прогонами"""
+        return [code for _, code in sorted(self.heap, reverse=True)]
+
+
+def sample(roots, limit: int = LIMIT) -> BottomK:
+    sampler = BottomK(limit)
+    for code in iter_snippets(iter_source_files(roots)):
+        sampler.offer(code)
+    return sampler
+
+
+# ---------- 5. сложность ----------
+
+def difficulty_scores(snippets) -> list:
+    """Сложность 1..5 с шагом 0.5 по рангу взвешенной суммы нормированных признаков"""
+    np = _numpy()
+    if not snippets:
+        return []
+    lengths = np.array([len(code) for code in snippets], dtype=np.float64)
+    # все символы одним массивом: признаки считаются без цикла по сниппетам
+    text = np.frombuffer("".join(snippets).encode("ascii"), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(snippets)), lengths.astype(np.int64))
+    symbol_table = np.zeros(128, dtype=bool)
+    symbol_table[[ord(char) for char in string.punctuation if char != "_"]] = True
+    symbol = symbol_table[text]
+    newline = text == ord("\n")
+    visible = (text != ord(" ")) & ~newline
+    # отступ: пробелы до первого непробельного символа строки
+    line_start = np.concatenate(([True], newline[:-1]))
+    line_start[np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)] = True
+    line_id = np.cumsum(line_start) - 1
+    position = np.arange(len(text))
+    first_visible = np.minimum.reduceat(np.where(text != ord(" "), position, len(text)), np.flatnonzero(line_start))
+    leading = position < first_visible[line_id]
+
+    features = np.column_stack([
+        np.bincount(owner, symbol, len(snippets)) / np.maximum(np.bincount(owner, visible, len(snippets)), 1),
+        np.bincount(owner, newline, len(snippets)) + 1,
+        np.bincount(owner, leading, len(snippets)) / INDENT / (np.bincount(owner, newline, len(snippets)) + 1),
+        lengths,
+    ])
+    spread = features.std(axis=0)
+    normalized = (features - features.mean(axis=0)) / np.where(spread > 0, spread, 1)
+    raw = normalized @ np.array([DIFFICULTY_WEIGHTS[k] for k in ("symbols", "lines", "indent", "chars")])
+    rank = np.argsort(np.argsort(raw, kind="stable"), kind="stable")
+    scale = 1 + 4 * rank / max(len(snippets) - 1, 1)
+    return (np.round(scale * 2) / 2).tolist()
+
+
+# ---------- вывод ----------
+
+def shard_name(n: int) -> str:
+    return f"{LANGUAGE}-{n:03d}.json"
+
+
+def write_corpus(sampler: BottomK, out: Path, shard_size: int = SHARD_SIZE) -> dict:
+    """Шарды и index.json; шарды, оставшиеся от прошлой сборки, удаляются.
+    Метки времени в файлы не пишутся: пересборка из тех же исходников не дает диффа"""
+    out.mkdir(parents=True, exist_ok=True)
+    snippets = sampler.snippets()
+    difficulties = difficulty_scores(snippets)
+    shards = []
+    # шарды поровну (не больше shard_size): короткого последнего шарда, который
+    # игрок может получить по seed, не бывает
+    count = max(1, -(-len(snippets) // shard_size))
+    for n in range(count):
+        # в шарде — весь диапазон сложности по возрастанию, как во встроенном каталоге
+        shard = sorted(zip(difficulties[n::count], snippets[n::count]))
+        name = shard_name(n)
+        (out / name).write_text(json.dumps({
+            "language": LANGUAGE,
+            "snippets": [{"code": code, "difficulty": difficulty} for difficulty, code in shard],
+        }, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+        shards.append(name)
+    for stale in out.glob("*-[0-9][0-9][0-9].json"):
+        if stale.name not in shards:
+            stale.unlink()
+    index = {"version": 1, "languages": {LANGUAGE: {"count": len(snippets), "shards": shards}}}
+    (out / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сборка корпуса сниппетов для Speed Typing")
+    parser.add_argument("roots", nargs="+", type=Path, help="каталоги с исходниками на JS")
+    parser.add_argument("--limit", type=int, default=LIMIT, help="сниппетов в корпусе")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="не больше сниппетов в шарде")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="каталог корпуса")
+    args = parser.parse_args(argv)
+
+    missing = [str(root) for root in args.roots if not root.is_dir()]
+    if missing:
+        parser.error(f"not a directory: {', '.join(missing)}")
+    _numpy()  # до долгого обхода, а не после
+
+    sampler = sample(args.roots, args.limit)
+    if not sampler.heap:
+        print("⚠️  Подходящих фрагментов не найдено")
+        return 1
+    entry = write_corpus(sampler, args.out, args.shard_size)["languages"][LANGUAGE]
+    print(f"✅ {LANGUAGE}: фрагментов {sampler.seen}, дублей {sampler.duplicates}, "
+          f"в корпусе {entry['count']} ({len(entry['shards'])} шардов)")
+    print(f"💾 {args.out / 'index.json'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
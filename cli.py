@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Единая точка входа для скриптов игры
+
+    python -m cli extract [--from-html PAGE]   fixedCode -> language_fixes.json
+    python -m cli validate [--language L ...]  проверка bugs-data.json компиляторами
+    python -m cli patch [--check] [--diff]     декларативные патчи страниц игр
+    python -m cli build                        сборка сабсетов шрифтов
+    python -m cli snippets SRC... [--limit N]  корпус сниппетов Speed Typing из исходников
+    python -m cli play [--local | --url URL]   бот проходит Bug Hunter
+                       [--soak ROUNDS]       soak-прогон всех игр с поиском утечек
+                       [--profile]           CPU-профиль каждого раунда (CDP Profiler)
+    python -m cli test [SUITE] [--profile]     браузерные тесты (по умолчанию quick)
+    play/test ... --browser fast|full          профиль браузера для всех запусков
+    python -m cli bench [--local] [--runs N]   замер загрузки страниц
+                        [--network P | --matrix]  под эмуляцией сети (fast-3g, slow-4g, ...)
+                        [--menu]                  клик в меню -> игра готова, с прогревом и без
+    python -m cli shots report|approve|gc      скриншоты и эталоны финальных экранов
+    python -m cli leaderboard [--port 8765]    сервис лидерборда для стенда
+    python -m cli history runs|p95|flaky       история прогонов тестов (SQLite)
+    python -m cli replay record|replay ...     запись и воспроизведение сессий набора
+
+Модули команд и Playwright импортируются только при запуске своей команды,
+поэтому extract/validate стартуют без браузерных зависимостей и годятся
+для pre-commit хуков.
+"""
+import argparse
+import importlib
+import sys
+
+# набор тестов -> (модуль, корутина без аргументов)
+TEST_SUITES = {
+    "quick": ("test_final_quick", "test"),
+    "languages": ("test_all_languages", "main"),
+    "new-bugs": ("test_new_10_bugs", "main"),
+    "final-screen": ("test_final_screen", "main"),
+    "final-screens": ("test_all_final_screens", "main"),
+    "final-screen-debug": ("test_final_screen_debug", "test_final_screen_debug"),
+}
+
+# команды, которые передают аргументы в main() своего модуля как есть
+PASSTHROUGH_COMMANDS = ("extract", "validate", "shots", "leaderboard", "history", "replay", "patch", "snippets")
+
+# наборы, чья корутина принимает profile=True
+PROFILED_SUITES = ["languages"]
+
+# профили из browser_profiles.py: список здесь, чтобы разбор аргументов не импортировал модули команд
+BROWSER_PROFILES = ["fast", "full"]
+BROWSER_HELP = "профиль браузера вместо выбранного скриптами: fast — headless без картинок и анимаций, full — как у игрока"
+
+
+def _run(coro):
+    import asyncio  # asyncio заметно замедляет старт, нужен только браузерным командам
+    return asyncio.run(coro)
+
+
+def cmd_extract(args, rest):
+    return importlib.import_module("extract_all_fixes").main(rest)
+
+
+def cmd_validate(args, rest):
+    return importlib.import_module("validate_bugs").main(rest)
+
+
+def cmd_shots(args, rest):
+    return importlib.import_module("screenshot_store").main(rest)
+
+
+def cmd_leaderboard(args, rest):
+    return importlib.import_module("leaderboard_server").main(rest)
+
+
+def cmd_history(args, rest):
+    return importlib.import_module("results_history").main(rest)
+
+
+def cmd_replay(args, rest):
+    return importlib.import_module("keystroke_replay").main(rest)
+
+
+def cmd_patch(args, rest):
+    return importlib.import_module("patch_html").main(rest)
+
+
+def cmd_snippets(args, rest):
+    return importlib.import_module("build_snippets").main(rest)
+
+
+def cmd_build(args, rest):
+    return importlib.import_module("build_fonts").main()
+
+
+def cmd_play(args, rest):
+    importlib.import_module("browser_profiles").select(args.browser)
+    bot = importlib.import_module("bug_hunter_bot")
+    if args.url:
+        url = args.url
+    else:
+        url = importlib.import_module("game_data").page_url("bug-hunter.html", args.local)
+    clean = _run(bot.main(url, soak_rounds=args.soak, profile=args.profile))
+    return 1 if clean is False else 0
+
+
+def cmd_test(args, rest):
+    importlib.import_module("browser_profiles").select(args.browser)
+    suites = list(TEST_SUITES) if args.suite == "all" else [args.suite]
+    for suite in suites:
+        module_name, func_name = TEST_SUITES[suite]
+        print(f"▶️  {suite} ({module_name}.py)")
+        kwargs = {"profile": True} if args.profile and suite in PROFILED_SUITES else {}
+        _run(getattr(importlib.import_module(module_name), func_name)(**kwargs))
+
+
+def cmd_bench(args, rest):
+    bench = importlib.import_module("bench_pages")
+    profiles = list(bench.NETWORK_PROFILES) if args.matrix else args.network
+    return _run(bench.main(runs=args.runs, local=args.local, profiles=profiles, menu=args.menu))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Скрипты code-typing-game")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # эти команды разбирают свои аргументы сами
+    commands.add_parser("extract", help="fixedCode -> language_fixes.json", add_help=False).set_defaults(func=cmd_extract)
+    commands.add_parser("validate", help="проверка bugs-data.json компиляторами", add_help=False).set_defaults(func=cmd_validate)
+    commands.add_parser("shots", help="скриншоты и эталоны финальных экранов", add_help=False).set_defaults(func=cmd_shots)
+    commands.add_parser("leaderboard", help="сервис лидерборда для стенда", add_help=False).set_defaults(func=cmd_leaderboard)
+    commands.add_parser("history", help="история прогонов тестов (SQLite)", add_help=False).set_defaults(func=cmd_history)
+    commands.add_parser("replay", help="запись и воспроизведение сессий набора", add_help=False).set_defaults(func=cmd_replay)
+    commands.add_parser("patch", help="декларативные патчи страниц игр", add_help=False).set_defaults(func=cmd_patch)
+    commands.add_parser("snippets", help="корпус сниппетов Speed Typing из исходников", add_help=False).set_defaults(func=cmd_snippets)
+    commands.add_parser("build", help="сборка сабсетов шрифтов").set_defaults(func=cmd_build)
+
+    play = commands.add_parser("play", help="бот проходит Bug Hunter")
+    play.add_argument("--local", action="store_true", help="открыть bug-hunter.html из репозитория")
+    play.add_argument("--url", help="URL страницы игры")
+    play.add_argument("--soak", type=int, default=0, metavar="ROUNDS",
+                      help="soak-прогон всех трёх игр на ROUNDS раундов с поиском утечек памяти")
+    play.add_argument("--profile", action="store_true", help="CPU-профиль каждого раунда в .profiles/")
+    play.add_argument("--browser", choices=BROWSER_PROFILES, help=BROWSER_HELP)
+    play.set_defaults(func=cmd_play)
+
+    test = commands.add_parser("test", help="браузерные тесты")
+    test.add_argument("suite", nargs="?", default="quick", choices=[*TEST_SUITES, "all"])
+    test.add_argument("--profile", action="store_true",
+                      help=f"CPU-профиль каждого раунда в .profiles/ (наборы: {', '.join(PROFILED_SUITES)})")
+    test.add_argument("--browser", choices=BROWSER_PROFILES, help=BROWSER_HELP)
+    test.set_defaults(func=cmd_test)
+
+    bench = commands.add_parser("bench", help="замер загрузки страниц")
+    bench.add_argument("--local", action="store_true", help="страницы из репозитория вместо прода")
+    bench.add_argument("--runs", type=int, default=3, help="прогонов на страницу")
+    bench.add_argument("--network", action="append", metavar="PROFILE",
+                       help="профиль сети: none, fast-3g, slow-4g, lossy-wifi, offline-after-load (можно несколько)")
+    bench.add_argument("--matrix", action="store_true", help="все профили сети")
+    bench.add_argument("--menu", action="store_true",
+                       help="время от клика в меню до готовой игры с prefetch/prerender и без")
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args, rest = build_parser().parse_known_args(argv)
+    if rest and args.command not in PASSTHROUGH_COMMANDS:
+        build_parser().error(f"unrecognized arguments: {' '.join(rest)}")
+    return args.func(args, rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
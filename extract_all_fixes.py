@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
 """
-Извлекает все fixedCode из bug-hunter.html для всех языков
+Извлекает все fixedCode для всех языков в language_fixes.json
+По умолчанию берет сценарии из bugs-data.json (их загружает bug-hunter.html),
+с --from-html — из встроенного списка сценариев страницы (speed-typing.html и др.)
 """
 
+import argparse
 import re
 import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+LANGUAGES = ["javascript", "python", "cpp", "csharp", "java", "golang"]
+
 
 def extract_language_fixes(content, language_key):
     """Извлекает исправленный код для одного языка"""
@@ -24,21 +33,29 @@ def extract_language_fixes(content, language_key):
 
     return fixed_codes
 
-def main():
-    # Читаем файл
-    with open("/Users/mikhailtrofimov/code/code-typing-game/bug-hunter.html", "r", encoding="utf-8") as f:
-        content = f.read()
+def extract_from_bugs_data():
+    """Извлекает исправленный код из bugs-data.json"""
+    with open(ROOT / "bugs-data.json", "r", encoding="utf-8") as f:
+        catalogue = json.load(f)
+    return {lang: [bug["fixedCode"] for bug in catalogue.get(lang, [])] for lang in LANGUAGES}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Извлечение fixedCode в language_fixes.json")
+    parser.add_argument("--from-html", metavar="PAGE", help="страница со встроенными сценариями, например speed-typing.html")
+    args = parser.parse_args(argv)
 
-    languages = ["javascript", "python", "cpp", "csharp", "java", "golang"]
-    all_fixes = {}
+    if args.from_html:
+        with open(ROOT / args.from_html, "r", encoding="utf-8") as f:
+            content = f.read()
+        all_fixes = {lang: extract_language_fixes(content, lang) for lang in LANGUAGES}
+    else:
+        all_fixes = extract_from_bugs_data()
 
-    for lang in languages:
-        fixes = extract_language_fixes(content, lang)
-        all_fixes[lang] = fixes
+    for lang, fixes in all_fixes.items():
         print(f"{lang.upper()}: {len(fixes)} багов")
 
     # Сохраняем в JSON
-    with open("language_fixes.json", "w", encoding="utf-8") as f:
+    with open(ROOT / "language_fixes.json", "w", encoding="utf-8") as f:
         json.dump(all_fixes, f, indent=2, ensure_ascii=False)
 
     print(f"\n✅ Все исправления сохранены в language_fixes.json")
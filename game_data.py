@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Общие данные игры для скриптов: каталог багов, решения и пути к страницам
+JSON читается при первом обращении, а не при импорте модуля, и пути
+считаются от корня репозитория, а не от текущей директории.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+PROD_URL = "https://mws-code-game.website.yandexcloud.net"
+
+
+@lru_cache(maxsize=None)
+def load_json(name: str):
+    with open(ROOT / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bugs_data() -> dict:
+    """Сценарии из bugs-data.json: {язык: [{description, buggyCode, fixedCode, ...}]}"""
+    return load_json("bugs-data.json")
+
+
+def language_fixes() -> dict:
+    """Исправленный код по языкам из language_fixes.json"""
+    return load_json("language_fixes.json")
+
+
+def page_url(page: str, local: bool = False) -> str:
+    """URL страницы игры: на проде или локальный файл из репозитория"""
+    return (ROOT / page).as_uri() if local else f"{PROD_URL}/{page}"
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Запись и воспроизведение сессий набора
+Страницы игр пишут каждое изменение редактора в keystrokeRecorder (смещение,
+длина удаленного, вставленный текст, игровое время). Этот скрипт:
+
+    python3 keystroke_replay.py record [--page speed-typing.html] [--local]
+        открывает браузер, человек играет, после финального экрана сессия
+        сохраняется в .sessions/<страница>_<время>.json
+    python3 keystroke_replay.py replay SESSION [--speed 1|10|max] [--local]
+        проигрывает сессию через настоящие правки Monaco (executeEdits)
+        и печатает задержку обработки каждого нажатия
+
+Воспроизведение идет в виртуальном времени: gameClock сдвигается ровно на
+интервалы из записи, поэтому переходы между раундами, таймер игры и
+"скорость" набора совпадают с оригиналом при любой скорости проигрывания.
+--speed задает только реальные паузы между нажатиями (max — без пауз).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from game_data import ROOT, page_url
+from results_history import percentile
+from virtual_clock import with_param, with_virtual_time, wait_game_ready
+
+SESSIONS_DIR = ROOT / ".sessions"
+
+START_FUNCTIONS = {
+    "typing": "startTypingGame",
+    "bugHunting": "startBugHuntingGame",
+}
+
+# Проигрывает события в странице. Перед событием следующего раунда дожидается
+# проверки в воркере (bug-hunt), иначе roundComplete() не успеет запланировать nextRound().
+# handler — синхронное время executeEdits (onDidChangeModelContent + checkCode),
+# frame — до следующего кадра, в котором gameView пишет фидбек в DOM (только при паузах).
+REPLAY_JS = """async ({ events, speed }) => {
+    const scorer = typeof bugScorer !== 'undefined' ? bugScorer : null;
+    const handler = [], frame = [];
+    let previous = 0;
+    for (let n = 0; n < events.t.length; n++) {
+        const delta = events.t[n] - previous;
+        previous = events.t[n];
+        if (events.round[n] !== currentRound && scorer) await scorer.settled();
+        if (speed > 0 && delta > 0) await new Promise(r => setTimeout(r, delta / speed));
+        gameClock.advance(delta);
+        if (events.round[n] !== currentRound) {
+            return { handler, frame, diverged: { event: n, round: currentRound, expected: events.round[n] } };
+        }
+
+        const model = editor.getModel();
+        const from = model.getPositionAt(events.offset[n]);
+        const to = model.getPositionAt(events.offset[n] + events.deleted[n]);
+        const range = new monaco.Range(from.lineNumber, from.column, to.lineNumber, to.column);
+        const started = performance.now();
+        editor.executeEdits('keystroke-replay', [{ range, text: events.text[n], forceMoveMarkers: true }]);
+        handler.push(performance.now() - started);
+        if (speed > 0) {
+            await new Promise(r => requestAnimationFrame(() => r()));
+            frame.push(performance.now() - started);
+        }
+    }
+    if (scorer) await scorer.settled();
+    gameView.flush();
+    return { handler, frame, diverged: null };
+}"""
+
+
+def print_latency(label: str, values):
+    if not values:
+        return
+    print(f"  {label:10} p50 {percentile(values, 0.5):6.2f} мс   p95 {percentile(values, 0.95):6.2f} мс"
+          f"   p99 {percentile(values, 0.99):6.2f} мс   max {max(values):6.2f} мс")
+
+
+def session_url(session: dict, local: bool) -> str:
+    """Страница сессии в виртуальном времени с тем же порядком сценариев"""
+    url = with_virtual_time(page_url(session["page"], local))
+    # сессии, записанные до перемешивания раундов, шли в порядке каталога
+    url = with_param(url, f"order={session.get('order', 'sequence')}")
+    if "seed" in session:
+        url = with_param(url, f"seed={session['seed']}")
+    # шард корпуса сниппетов; сессии до корпуса играли встроенными
+    return with_param(url, f"snippets={session.get('snippets', 'builtin')}")
+
+
+async def record(page_name: str, local: bool, out: Path = None) -> Path:
+    """Человек играет в открытом браузере, после финального экрана сессия пишется в файл"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=False)
+        try:
+            page = await browser.new_page()
+            await page.goto(page_url(page_name, local))
+            print(f"⌨️  Играйте в {page_name}: сессия сохранится после финального экрана")
+            await page.wait_for_selector("#finalScreen.show", timeout=0)
+            session = await page.evaluate("keystrokeRecorder.export()")
+        finally:
+            await browser.close()
+
+    SESSIONS_DIR.mkdir(exist_ok=True)
+    out = out or SESSIONS_DIR / f"{Path(page_name).stem}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.write_text(json.dumps(session, ensure_ascii=False), encoding="utf-8")
+    print(f"💾 Сессия: {out} ({len(session['events']['t'])} событий, раундов: {session['roundsCompleted']})")
+    if session["truncated"]:
+        print("⚠️  Буфер записи переполнился, начало сессии потеряно — воспроизвести ее не получится")
+    return out
+
+
+async def replay(session_path: Path, speed: float, local: bool) -> bool:
+    """Проигрывает сессию, возвращает True, если игра пришла к тому же числу раундов"""
+    from playwright.async_api import async_playwright
+
+    session = json.loads(session_path.read_text(encoding="utf-8"))
+    if session["truncated"]:
+        print("❌ Сессия неполная (переполнение буфера записи)")
+        return False
+    events = session["events"]
+    print(f"▶️  {session_path.name}: {session['page']} ({session['mode']}"
+          f"{', ' + session['language'] if session['language'] else ''}), "
+          f"{len(events['t'])} событий, скорость {'max' if not speed else f'{speed:g}x'}")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            await page.goto(session_url(session, local))
+            await wait_game_ready(page)
+            if session["language"]:
+                await page.select_option("#languageSelector", value=session["language"])
+            await page.evaluate(f"{START_FUNCTIONS[session['mode']]}()")
+
+            started = asyncio.get_running_loop().time()
+            result = await page.evaluate(REPLAY_JS, {"events": events, "speed": speed})
+            wall = asyncio.get_running_loop().time() - started
+            rounds = await page.evaluate("roundsCompleted")
+        finally:
+            await browser.close()
+
+    print(f"  проиграно за {wall:.1f} с (в записи {events['t'][-1] / 1000:.1f} с игрового времени)")
+    print_latency("обработка", result["handler"])
+    print_latency("до кадра", result["frame"])
+
+    if result["diverged"]:
+        d = result["diverged"]
+        print(f"❌ Расхождение на событии {d['event']}: игра в раунде {d['round']}, в записи {d['expected']}")
+        return False
+    ok = rounds == session["roundsCompleted"]
+    print(f"{'✅' if ok else '❌'} Раундов пройдено: {rounds} (в записи {session['roundsCompleted']})")
+    return ok
+
+
+def parse_speed(value: str) -> float:
+    """'max' -> 0 (без пауз), иначе множитель скорости"""
+    return 0.0 if value == "max" else float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Запись и воспроизведение сессий набора")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="записать сессию живой игры")
+    rec.add_argument("--page", default="speed-typing.html")
+    rec.add_argument("--local", action="store_true", help="локальные файлы вместо прода")
+    rec.add_argument("--out", type=Path, help="файл сессии (по умолчанию .sessions/...)")
+    rep = commands.add_parser("replay", help="воспроизвести сессию и замерить задержку нажатий")
+    rep.add_argument("session", type=Path)
+    rep.add_argument("--speed", type=parse_speed, default=parse_speed("max"), help="1, 10, ... или max")
+    rep.add_argument("--local", action="store_true", help="локальные файлы вместо прода")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        asyncio.run(record(args.page, args.local, args.out))
+        return 0
+    return 0 if asyncio.run(replay(args.session, args.speed, args.local)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
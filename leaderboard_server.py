@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Локальный сервис лидерборда для стенда
+Игры отправляют результат с финального экрана (POST /results), большой
+экран читает таблицу (GET /leaderboard?game=bugHunting&language=python).
+
+- Для каждой пары (игра, язык) и для игры целиком ("*") хранится top-K
+  в min-heap: вставка O(log K), худший результат из топа вытесняется.
+- Каждый принятый результат дописывается в append-only лог leaderboard.log
+  (JSON на строку). Запись идет пачками фоновой задачей раз в
+  FLUSH_INTERVAL, поэтому всплеск финишей с десятков киосков не ждет диска.
+  При старте лог проигрывается, а затем переписывается только с
+  результатами из топов, чтобы не расти бесконечно.
+- Ответы GET /leaderboard кэшируются до следующего изменения своего топа.
+
+Порядок мест: больше раундов выше, при равенстве — меньше времени.
+Только стандартная библиотека: python3 leaderboard_server.py --port 8765
+Игры подключаются параметром ?leaderboard=http://<хост>:8765 (запоминается).
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent
+LOG_FILE = ROOT / "leaderboard.log"
+
+TOP_K = 50
+FLUSH_INTERVAL = 0.2      # секунд между пачками записи в лог
+MAX_BODY = 4096           # байт в теле POST
+GAMES = {"typing", "bugHunting", "architect"}
+ALL_LANGUAGES = "*"
+# языки Bug Hunter (ключи bugs-data.json); другие таблицы не заводятся и не кэшируются
+LANGUAGES = {"javascript", "python", "cpp", "csharp", "java", "golang", ALL_LANGUAGES}
+
+
+class Leaderboard:
+    """Top-K результатов по ключу (игра, язык)"""
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.heaps = {}              # ключ -> min-heap [(rounds, -seconds, -seq, entry)]
+        self.versions = {}           # ключ -> счетчик изменений для кэша ответов
+        self.cache = {}              # (ключ, limit) -> (версия, bytes)
+        self.seq = itertools.count()
+
+    @staticmethod
+    def rank_key(entry: dict, seq: int):
+        # min-heap держит наверху худший результат; при равенстве хуже тот, кто пришел позже
+        return (entry["rounds"], -entry["seconds"], -seq)
+
+    def add(self, entry: dict) -> bool:
+        """Добавляет результат, возвращает True, если он попал хотя бы в один топ"""
+        seq = next(self.seq)
+        item = (*self.rank_key(entry, seq), entry)
+        placed = False
+        for key in {(entry["game"], entry["language"]), (entry["game"], ALL_LANGUAGES)}:
+            heap = self.heaps.setdefault(key, [])
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, item)
+            else:
+                continue
+            self.versions[key] = self.versions.get(key, 0) + 1
+            placed = True
+        return placed
+
+    def top(self, game: str, language: str, limit: int) -> bytes:
+        """Отсортированный топ в виде готового JSON-ответа (из кэша, если топ не менялся)"""
+        key = (game, language)
+        version = self.versions.get(key, 0)
+        cached = self.cache.get((key, limit))
+        if cached and cached[0] == version:
+            return cached[1]
+        ranked = sorted(self.heaps.get(key, []), key=lambda item: item[:3], reverse=True)[:limit]
+        body = json.dumps({
+            "game": game,
+            "language": language,
+            "results": [{"place": place, **item[3]} for place, item in enumerate(ranked, 1)],
+        }, ensure_ascii=False).encode("utf-8")
+        self.cache[(key, limit)] = (version, body)
+        return body
+
+    def retained(self):
+        """Результаты, которые еще входят хотя бы в один топ (для компактизации лога)"""
+        seen = {}
+        for heap in self.heaps.values():
+            for *_, entry in heap:
+                seen[id(entry)] = entry
+        return sorted(seen.values(), key=lambda entry: entry["at"])
+
+
+def _finite(value, field: str):
+    """Числовое поле результата; 1e400 из JSON — это inf, и int() упал бы с OverflowError"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{field} must be a finite number")
+    return value
+
+
+def parse_result(payload: dict) -> dict:
+    """Проверяет и нормализует результат из POST /results"""
+    if not isinstance(payload, dict):
+        raise ValueError("result must be a JSON object")
+    game = payload.get("game")
+    if game not in GAMES:
+        raise ValueError(f"unknown game: {game!r}")
+    language = payload.get("language") or ALL_LANGUAGES
+    if language not in LANGUAGES:
+        raise ValueError(f"unknown language: {language!r}")
+    rounds = int(_finite(payload["rounds"], "rounds"))
+    seconds = int(_finite(payload["seconds"], "seconds"))
+    if not (0 <= rounds <= 1000 and 0 <= seconds <= 3600):
+        raise ValueError("rounds/seconds out of range")
+    return {
+        "game": game,
+        "language": language,
+        "rounds": rounds,
+        "seconds": seconds,
+        "kiosk": str(payload["kiosk"])[:40] if payload.get("kiosk") else None,
+        # antiCheat пометил подозрительную скорость набора: результат остается, но виден при разборе
+        "flagged": bool(payload.get("flagged")),
+        "at": round(_finite(payload.get("at") or time.time(), "at"), 3),
+    }
+
+
+class LeaderboardServer:
+    def __init__(self, log_path: Path = LOG_FILE, k: int = TOP_K):
+        self.board = Leaderboard(k)
+        self.log_path = log_path
+        self.pending = []        # строки лога, ожидающие записи
+        self.writing = None      # future текущей записи пачки в потоке
+
+    def recover(self) -> int:
+        """Проигрывает лог и переписывает его только с результатами из топов"""
+        if not self.log_path.exists():
+            return 0
+        replayed = 0
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self.board.add(parse_result(json.loads(line)))
+                    replayed += 1
+                except (ValueError, KeyError, TypeError, OverflowError):
+                    continue  # оборванная при падении последняя строка
+        tmp = self.log_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self.board.retained():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.log_path)
+        return replayed
+
+    async def flush_loop(self):
+        """Групповая запись лога: одна запись и fsync на пачку результатов"""
+        loop = asyncio.get_running_loop()
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            try:
+                while True:
+                    await asyncio.sleep(FLUSH_INTERVAL)
+                    if not self.pending:
+                        continue
+                    batch, self.pending = self.pending, []
+                    self.writing = loop.run_in_executor(None, self._write, log, "".join(batch))
+                    await asyncio.shield(self.writing)
+            finally:
+                # при остановке дожидаемся пачки в потоке и дописываем остаток
+                if self.writing:
+                    await asyncio.wait([self.writing])
+                if self.pending:
+                    self._write(log, "".join(self.pending))
+                    self.pending = []
+
+    @staticmethod
+    def _write(log, data: str):
+        log.write(data)
+        log.flush()
+        os.fsync(log.fileno())
+
+    def submit(self, payload: dict) -> dict:
+        entry = parse_result(payload)
+        self.pending.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        return {"accepted": True, "top": self.board.add(entry)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, b'{"error": "body too large"}')
+                    break
+                body = await reader.readexactly(length) if length else b""
+                await self.route(writer, method, target, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, writer, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        if method == "OPTIONS":
+            await self.respond(writer, 204, b"")
+        elif method == "POST" and url.path == "/results":
+            try:
+                # sendBeacon присылает text/plain, поэтому тело разбираем как JSON независимо от заголовка
+                result = self.submit(json.loads(body))
+            except (ValueError, KeyError, TypeError, OverflowError) as e:
+                await self.respond(writer, 400, json.dumps({"error": str(e)}).encode("utf-8"))
+                return
+            await self.respond(writer, 202, json.dumps(result).encode("utf-8"))
+        elif method == "GET" and url.path == "/leaderboard":
+            query = parse_qs(url.query)
+            game = query.get("game", ["bugHunting"])[0]
+            language = query.get("language", [ALL_LANGUAGES])[0]
+            if game not in GAMES or language not in LANGUAGES:
+                # кэш ответов заводится только для известных таблиц
+                await self.respond(writer, 404, b'{"error": "unknown game or language"}')
+                return
+            try:
+                limit = int(query.get("limit", ["10"])[0])
+            except ValueError:
+                await self.respond(writer, 400, b'{"error": "limit must be an integer"}')
+                return
+            limit = max(1, min(limit, self.board.k))
+            await self.respond(writer, 200, self.board.top(game, language, limit))
+        elif method == "GET" and url.path == "/health":
+            await self.respond(writer, 200, json.dumps({"pending": len(self.pending)}).encode("utf-8"))
+        else:
+            await self.respond(writer, 404, b'{"error": "not found"}')
+
+    @staticmethod
+    async def respond(writer, status: int, body: bytes):
+        reason = {200: "OK", 202: "Accepted", 204: "No Content", 400: "Bad Request",
+                  404: "Not Found", 413: "Payload Too Large"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            "Cache-Control: no-cache\r\n"
+            "\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+
+async def serve(host: str, port: int, log_path: Path = LOG_FILE, k: int = TOP_K):
+    server = LeaderboardServer(log_path, k)
+    replayed = server.recover()
+    print(f"📜 Восстановлено из лога: {replayed} результатов")
+    flusher = asyncio.create_task(server.flush_loop())
+    tcp = await asyncio.start_server(server.handle, host, port)
+    print(f"🏆 Лидерборд слушает http://{host}:{port} (top-{k})")
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервис лидерборда для стенда")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--top", type=int, default=TOP_K, help="сколько результатов хранить на таблицу")
+    parser.add_argument("--log", type=Path, default=LOG_FILE, help="append-only лог результатов")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.log, args.top))
+    except KeyboardInterrupt:
+        print("\n👋 Лидерборд остановлен")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Пакетные правки страниц игр декларативными патчами
+Каждая страница читается один раз, к ней по порядку применяются все
+патчи из PATCHES, и файл записывается один раз, только если что-то
+изменилось. Страницы обрабатываются параллельно в пуле процессов.
+
+Патчи идемпотентны: повторный запуск ничего не меняет.
+  - style_block — CSS-файл внутри <style> между маркерами
+    /* patch:<имя> begin */ и /* patch:<имя> end */; при изменении CSS блок
+    переписывается целиком, без маркеров — вставляется перед </style>
+  - replace — замена фрагмента скрипта; если новый текст уже на месте,
+    патч считается примененным, если нет ни старого, ни нового — ошибка
+  - sub — регулярное выражение, которое само не совпадает с уже
+    исправленным кодом (negative lookahead)
+
+    python3 patch_html.py                применить все патчи
+    python3 patch_html.py --check        только проверить (код 1, если есть что менять)
+    python3 patch_html.py --diff         показать diff изменений
+    python3 patch_html.py --patch NAME   только выбранные патчи (можно несколько)
+"""
+import argparse
+import difflib
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+GAME_PAGES = ("bug-hunter.html", "speed-typing.html", "cloud-architect.html")
+
+STYLE_END = "    </style>"
+STYLE_INDENT = " " * 8
+
+
+class PatchError(Exception):
+    """Патч не нашел, к чему примениться"""
+
+
+def style_block(name: str, css_file: str):
+    """Содержимое css_file внутри первого <style> страницы между маркерами"""
+    marked = re.compile(rf" */\* patch:{name} begin[^\n]*\*/\n.*? */\* patch:{name} end \*/\n", re.S)
+
+    def apply(content: str):
+        css = (ROOT / css_file).read_text(encoding="utf-8").rstrip("\n")
+        body = "\n".join(STYLE_INDENT + line if line.strip() else "" for line in css.split("\n"))
+        block = (f"{STYLE_INDENT}/* patch:{name} begin ({css_file}, generated by patch_html.py) */\n"
+                 f"{body}\n{STYLE_INDENT}/* patch:{name} end */\n")
+        if match := marked.search(content):
+            new = content[:match.start()] + block + content[match.end():]
+        elif body + "\n" in content:
+            # блок, вставленный раньше без маркеров: только размечаем
+            new = content.replace(body + "\n", block, 1)
+        elif STYLE_END in content:
+            end = content.index(STYLE_END)
+            separator = "" if content[:end].endswith("\n\n") else "\n"
+            new = content[:end] + separator + block + "\n" + content[end:]
+        else:
+            raise PatchError("не найден </style>")
+        return new, int(new != content)
+    return apply
+
+
+def replace(old: str, new: str):
+    """Замена всех вхождений old на new"""
+    def apply(content: str):
+        if new in content:
+            return content, 0
+        count = content.count(old)
+        if not count:
+            raise PatchError(f"не найден фрагмент {old.strip()[:60]!r}")
+        return content.replace(old, new), count
+    return apply
+
+
+def sub(pattern: str, repl: str):
+    """re.subn с флагом MULTILINE; pattern не должен совпадать с уже исправленным кодом"""
+    regex = re.compile(pattern, re.M)
+
+    def apply(content: str):
+        return regex.subn(repl, content)
+    return apply
+
+
+def in_functions(names, pattern: str, repl: str):
+    """re.subn (MULTILINE, одна замена) только внутри тел функций names — от
+    «function name(» до закрывающей скобки на том же отступе; pattern не должен
+    совпадать с уже исправленным кодом"""
+    regex = re.compile(pattern, re.M)
+
+    def apply(content: str):
+        total = 0
+        for name in names:
+            header = re.search(rf"^( *)(?:async )?function {name}\(", content, re.M)
+            if not header:
+                raise PatchError(f"не найдена функция {name}")
+            end = content.find(f"\n{header.group(1)}}}\n", header.end())
+            if end < 0:
+                raise PatchError(f"не найден конец функции {name}")
+            body, count = regex.subn(repl, content[header.end():end], count=1)
+            content = content[:header.end()] + body + content[end:]
+            total += count
+        return content, total
+    return apply
+
+
+# функции, которые начинают игру: в них счетчик пройденных раундов обнуляется
+GAME_START_FUNCTIONS = ("startTypingGame", "startBugHuntingGame", "startArchitectGame")
+
+# имя -> (страницы, шаги); шаги применяются по порядку
+PATCHES = {
+    "mobile-styles": (GAME_PAGES, [style_block("mobile-styles", "mobile_styles.css")]),
+    "reduced-motion": (GAME_PAGES, [style_block("reduced-motion", "reduced_motion.css")]),
+    # счетчик пройденных раундов отдельно от номера текущего раунда
+    "rounds-counter": (GAME_PAGES, [
+        replace("        let currentRound = 0;\n",
+                "        let currentRound = 0;\n"
+                "        let roundsCompleted = 0; // Count of successfully completed rounds\n"),
+        in_functions(["roundComplete"],
+                     r"^(?<!roundsCompleted\+\+; // Increment completed rounds counter\n\n)( +)updateStats\(\);",
+                     r"\1roundsCompleted++; // Increment completed rounds counter\n\n\1updateStats();"),
+        in_functions(GAME_START_FUNCTIONS,
+                     r"^( +)currentRound = 0;\n(?!\1roundsCompleted = 0;)", r"\1currentRound = 0;\n\1roundsCompleted = 0;\n"),
+    ]),
+    # финальный экран показывает пройденные раунды, а не номер начатого
+    "final-rounds-completed": (GAME_PAGES, [
+        sub(r"^ *// currentRound is the round that was started[^\n]*\n", ""),
+        sub(r"(getElementById\('finalRoundsCompleted'\)\.textContent = )"
+            r"(?:currentRound|Math\.max\(0, currentRound - 1\));", r"\1roundsCompleted;"),
+        sub(r"Вы исправили \$\{currentRound\} \$\{currentRound === 1 \? 'баг' : currentRound < 5",
+            "Вы исправили ${roundsCompleted} ${roundsCompleted === 1 ? 'баг' : roundsCompleted < 5"),
+        sub(r"Пройдено уровней: \$\{currentRound\}/7", "Пройдено уровней: ${roundsCompleted}/7"),
+    ]),
+}
+
+
+def patch_page(page: str, names, write: bool = True) -> dict:
+    """Применяет патчи к одной странице (выполняется в пуле процессов)"""
+    path = ROOT / page
+    original = content = path.read_text(encoding="utf-8")
+    results = []
+    for name in names:
+        pages, steps = PATCHES[name]
+        if page not in pages:
+            continue
+        try:
+            changes = 0
+            for step in steps:
+                content, count = step(content)
+                changes += count
+            results.append({"patch": name, "changes": changes})
+        except PatchError as e:
+            results.append({"patch": name, "error": str(e)})
+
+    diff = ""
+    if content != original:
+        diff = "".join(difflib.unified_diff(
+            original.splitlines(keepends=True), content.splitlines(keepends=True), page, page, n=1))
+        if write:
+            path.write_text(content, encoding="utf-8")
+    return {"page": page, "results": results, "changed": content != original, "diff": diff}
+
+
+def run(names=None, write: bool = True, jobs: int = None) -> list:
+    names = names or list(PATCHES)
+    pages = list(dict.fromkeys(page for name in names for page in PATCHES[name][0]))
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(patch_page, page, names, write) for page in pages]
+        return [future.result() for future in futures]
+
+
+def print_report(reports, show_diff: bool = False, write: bool = True) -> bool:
+    ok = True
+    for report in reports:
+        print(f"{'✏️ ' if report['changed'] else '— '} {report['page']}")
+        for result in report["results"]:
+            if "error" in result:
+                ok = False
+                print(f"    ❌ {result['patch']}: {result['error']}")
+            elif result["changes"]:
+                verb = "изменений" if write else "нужно изменений"
+                print(f"    ✅ {result['patch']}: {verb} {result['changes']}")
+            else:
+                print(f"    ✔️  {result['patch']}: уже применен")
+        if show_diff and report["diff"]:
+            print(report["diff"])
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетные правки страниц игр")
+    parser.add_argument("--patch", action="append", choices=list(PATCHES), help="только этот патч (можно несколько)")
+    parser.add_argument("--check", action="store_true", help="ничего не записывать, код 1 если страницы устарели")
+    parser.add_argument("--diff", action="store_true", help="показать diff изменений")
+    parser.add_argument("--jobs", type=int, default=None, help="число процессов (по умолчанию — по числу CPU)")
+    args = parser.parse_args(argv)
+
+    reports = run(args.patch, write=not args.check, jobs=args.jobs)
+    ok = print_report(reports, args.diff, write=not args.check)
+    if args.check and any(report["changed"] for report in reports):
+        print("⚠️  Страницы устарели: запустите python3 patch_html.py")
+        return 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
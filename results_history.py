@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+История прогонов браузерных тестов в SQLite (test_history.sqlite)
+test_all_languages.py и test_new_10_bugs.py дописывают сюда каждый раунд:
+язык, сценарий, время проверки, текст фидбека, успех/ошибку и окружение
+прогона (коммит, версия браузера, URL). Отчеты test_results*.json по-прежнему
+пишутся, но перезаписываются, а история копится.
+
+    python3 results_history.py runs [--last 20]
+    python3 results_history.py p95 --language golang [--last 50] [--suite languages]
+    python3 results_history.py flaky [--last 50]
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+DB_FILE = ROOT / "test_history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    suite TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    url TEXT,
+    git_commit TEXT,
+    environment TEXT            -- JSON: браузер, платформа, python
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    language TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    scenario TEXT,
+    duration_ms REAL,           -- от установки кода до чтения фидбека
+    feedback TEXT,
+    success INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS rounds_run ON rounds(run_id);
+CREATE INDEX IF NOT EXISTS rounds_language ON rounds(language, run_id);
+CREATE INDEX IF NOT EXISTS rounds_scenario ON rounds(scenario, run_id);
+CREATE INDEX IF NOT EXISTS runs_suite ON runs(suite, id);
+"""
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def percentile(values, share: float):
+    """Перцентиль с линейной интерполяцией (как numpy.percentile по умолчанию)"""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * share
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class ResultsHistory:
+    def __init__(self, path: Path = None):
+        self.db = sqlite3.connect(path or DB_FILE)
+        self.db.executescript(SCHEMA)
+
+    def start_run(self, suite: str, url: str = None, browser_version: str = None) -> int:
+        environment = {
+            "browser": browser_version,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        }
+        cursor = self.db.execute(
+            "INSERT INTO runs (suite, started_at, url, git_commit, environment) VALUES (?, ?, ?, ?, ?)",
+            (suite, datetime.now().isoformat(timespec="seconds"), url, git_commit(), json.dumps(environment)),
+        )
+        self.db.commit()
+        return cursor.lastrowid
+
+    def record_round(self, run_id: int, language: str, round_number: int, scenario: str = None,
+                     duration_ms: float = None, feedback: str = None, success: bool = False, error: str = None):
+        self.db.execute(
+            "INSERT INTO rounds (run_id, language, round, scenario, duration_ms, feedback, success, error)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, language, round_number, scenario, duration_ms, feedback, int(success), error),
+        )
+
+    def finish_run(self, run_id: int):
+        self.db.execute("UPDATE runs SET finished_at = ? WHERE id = ?",
+                        (datetime.now().isoformat(timespec="seconds"), run_id))
+        self.db.commit()
+
+    def last_run_ids(self, last: int, suite: str = None):
+        query = "SELECT id FROM runs" + (" WHERE suite = ?" if suite else "") + " ORDER BY id DESC LIMIT ?"
+        return [row[0] for row in self.db.execute(query, (suite, last) if suite else (last,))]
+
+    def round_times(self, language: str, last: int, suite: str = None):
+        """{run_id: [duration_ms успешных раундов]} по последним прогонам"""
+        run_ids = self.last_run_ids(last, suite)
+        if not run_ids:
+            return {}
+        marks = ",".join("?" * len(run_ids))
+        rows = self.db.execute(
+            f"SELECT run_id, duration_ms FROM rounds WHERE language = ? AND success = 1"
+            f" AND duration_ms IS NOT NULL AND run_id IN ({marks}) ORDER BY run_id",
+            (language, *run_ids),
+        )
+        times = {}
+        for run_id, duration in rows:
+            times.setdefault(run_id, []).append(duration)
+        return times
+
+    def flaky_scenarios(self, last: int, suite: str = None):
+        """Сценарии, которые в последних прогонах то проходили, то падали"""
+        run_ids = self.last_run_ids(last, suite)
+        if not run_ids:
+            return []
+        marks = ",".join("?" * len(run_ids))
+        return self.db.execute(
+            f"""SELECT language, scenario, COUNT(*) AS attempts, SUM(success) AS passed,
+                       MAX(CASE WHEN success = 0 THEN COALESCE(error, feedback) END) AS last_failure
+                FROM rounds WHERE scenario IS NOT NULL AND run_id IN ({marks})
+                GROUP BY language, scenario
+                HAVING passed > 0 AND passed < attempts
+                ORDER BY 1.0 * passed / attempts, attempts DESC""",
+            run_ids,
+        ).fetchall()
+
+
+def cmd_runs(history: ResultsHistory, args):
+    rows = history.db.execute(
+        """SELECT r.id, r.suite, r.started_at, r.git_commit,
+                  COUNT(x.id), COALESCE(SUM(x.success), 0), COUNT(DISTINCT x.language)
+           FROM runs r LEFT JOIN rounds x ON x.run_id = r.id
+           GROUP BY r.id ORDER BY r.id DESC LIMIT ?""",
+        (args.last,),
+    ).fetchall()
+    for run_id, suite, started, commit, rounds, passed, languages in rows:
+        icon = "✅" if rounds and passed == rounds else "❌"
+        print(f"{icon} #{run_id:<5} {started}  {suite:10} {commit or '-':9} "
+              f"раундов {passed}/{rounds}, языков {languages}")
+
+
+def cmd_p95(history: ResultsHistory, args):
+    times = history.round_times(args.language, args.last, args.suite)
+    if not times:
+        print(f"Нет данных для {args.language}")
+        return
+    print(f"⏱️  {args.language}: время раунда по последним {len(times)} прогонам (мс)")
+    print(f"  {'прогон':>7} {'раундов':>8} {'p50':>8} {'p95':>8}")
+    for run_id in sorted(times):
+        values = times[run_id]
+        print(f"  #{run_id:<6} {len(values):8} {percentile(values, 0.5):8.1f} {percentile(values, 0.95):8.1f}")
+    all_values = [v for values in times.values() for v in values]
+    print(f"  {'всего':7} {len(all_values):8} {percentile(all_values, 0.5):8.1f} {percentile(all_values, 0.95):8.1f}")
+
+    # дрейф: p95 последней трети прогонов против первой
+    run_p95 = [percentile(times[run_id], 0.95) for run_id in sorted(times)]
+    third = len(run_p95) // 3
+    if third:
+        before, after = percentile(run_p95[:third], 0.5), percentile(run_p95[-third:], 0.5)
+        print(f"📈 Медиана p95: {before:.1f} → {after:.1f} мс ({(after - before) / before:+.0%})")
+
+
+def cmd_flaky(history: ResultsHistory, args):
+    rows = history.flaky_scenarios(args.last, args.suite)
+    if not rows:
+        print("✅ Нестабильных сценариев нет")
+        return
+    print(f"⚠️  Нестабильные сценарии (последние {args.last} прогонов):")
+    for language, scenario, attempts, passed, failure in rows:
+        print(f"  {language:10} {passed}/{attempts}  {scenario[:60]}")
+        if failure:
+            print(f"  {'':10}        пример ошибки: {failure[:80]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="История прогонов браузерных тестов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs = commands.add_parser("runs", help="последние прогоны")
+    runs.add_argument("--last", type=int, default=20)
+    runs.set_defaults(func=cmd_runs)
+
+    p95 = commands.add_parser("p95", help="p50/p95 времени раунда по прогонам")
+    p95.add_argument("--language", required=True)
+    p95.add_argument("--last", type=int, default=50)
+    p95.add_argument("--suite")
+    p95.set_defaults(func=cmd_p95)
+
+    flaky = commands.add_parser("flaky", help="сценарии, которые то проходят, то падают")
+    flaky.add_argument("--last", type=int, default=50)
+    flaky.add_argument("--suite")
+    flaky.set_defaults(func=cmd_flaky)
+
+    args = parser.parse_args(argv)
+    if not DB_FILE.exists():
+        print("Истории еще нет: запустите python -m cli test languages")
+        return 0
+    args.func(ResultsHistory(), args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Профилирование раундов игры через CDP Profiler
+Каждый раунд (setValue → roundComplete → nextRound) записывается отдельным
+профилем в .profiles/<время запуска>/<раунд>.cpuprofile — его можно открыть
+в DevTools (Performance → Load profile) или speedscope. По всему прогону
+собирается self-time по функциям и файл collapsed.txt (формат folded stacks
+для flamegraph.pl / speedscope).
+
+Проверка в код-хантинге (calculateSimilarity, scoreBugFix) выполняется в
+Web Worker (bugScorer), поэтому профилировщик подключается и к воркерам
+страницы (среди них и воркеры самого Monaco): их профили пишутся рядом (<раунд>.worker-N.cpuprofile), а время
+складывается в общую сводку, стеки — под корнем (worker).
+
+Monaco грузится минифицированным, имена функций в нем ничего не говорят.
+Токенизация определяется по модулю исходника: позиция функции переводится
+через source map Monaco (min-maps/ на том же CDN) в путь вроде
+vs/editor/standalone/common/monarch/monarchLexer.ts. Если карта не
+загрузилась, токенизация в сводке не выделяется (Monaco: всего — считается).
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from bisect import bisect_right
+from collections import defaultdict
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+ROOT = Path(__file__).resolve().parent
+PROFILES_DIR = ROOT / ".profiles"
+
+SAMPLING_INTERVAL_US = 100
+
+# Функции игры, которые всегда показываем в сводке, даже если они не в топе
+WATCHED_FUNCTIONS = [
+    "checkCode", "applyBugScore", "calculateSimilarity", "scoreBugFix",
+    "roundComplete", "nextRound", "prepareRound", "prefetchNextRound",
+    "redrawConnections", "validateRealTime", "addBlockToCanvas",
+]
+
+# Служебные узлы V8, которые не относятся к коду страницы
+IDLE_FRAMES = {"(idle)", "(program)", "(garbage collector)", "(root)"}
+
+# Модули Monaco, которые разбирают текст на токены (путь из source map или URL):
+# Monarch-лексер, фоновая токенизация модели, определения языков basic-languages
+MONACO_TOKENIZATION_MODULES = ("/monarch/", "/tokens/", "textmodeltokens", "tokenization", "/basic-languages/")
+
+BASE64_DIGITS = {char: i for i, char in enumerate(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+def frame_name(call_frame: dict) -> str:
+    """Имя функции с коротким указанием источника: checkCode (bug-hunter.html:3147)"""
+    name = call_frame["functionName"] or "(anonymous)"
+    url = call_frame.get("url") or ""
+    if not url:
+        return name
+    source = url.rsplit("/", 1)[-1].split("?")[0] or url
+    return f"{name} ({source}:{call_frame['lineNumber'] + 1})"
+
+
+def is_monaco(call_frame: dict) -> bool:
+    return "monaco-editor" in (call_frame.get("url") or "")
+
+
+def is_tokenization_module(path: str) -> bool:
+    path = path.lower()
+    return any(module in path for module in MONACO_TOKENIZATION_MODULES)
+
+
+def source_map_url(script_url: str) -> str:
+    """Карта минифицированного файла Monaco: .../min/vs/x.js -> .../min-maps/vs/x.js.map"""
+    return script_url.replace("/min/vs/", "/min-maps/vs/", 1) + ".map"
+
+
+def decode_vlq(segment: str) -> list:
+    """Поля сегмента mappings из source map (base64 VLQ)"""
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = BASE64_DIGITS[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+class SourceMap:
+    """Только то, что нужно профилировщику: позиция в сгенерированном файле -> исходный модуль"""
+
+    def __init__(self, data: dict):
+        self.sources = data["sources"]
+        self.lines = []  # по строкам сгенерированного файла: (колонки, индексы sources)
+        source = 0
+        for line in data["mappings"].split(";"):
+            column, columns, sources = 0, [], []
+            for segment in line.split(","):
+                if not segment:
+                    continue
+                fields = decode_vlq(segment)
+                column += fields[0]
+                if len(fields) > 1:
+                    source += fields[1]
+                    columns.append(column)
+                    sources.append(source)
+            self.lines.append((columns, sources))
+
+    def source(self, line: int, column: int) -> str | None:
+        if line >= len(self.lines):
+            return None
+        columns, sources = self.lines[line]
+        i = bisect_right(columns, column) - 1
+        return self.sources[sources[i]] if i >= 0 else None
+
+
+def profile_round(profiler: RoundProfiler | None, label: str):
+    """profiler.round(label), а без профилировщика — пустой контекст"""
+    return profiler.round(label) if profiler else nullcontext()
+
+
+class RoundProfiler:
+    def __init__(self, page: Page, run_name: str = None):
+        self.page = page
+        self.cdp = None
+        self.out_dir = PROFILES_DIR / (run_name or datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.self_time = defaultdict(float)      # frame_name -> мкс
+        self.function_time = defaultdict(float)  # имя функции -> мкс (без учета источника)
+        self.collapsed = defaultdict(float)      # "a;b;c" -> мкс
+        self.monaco_time = 0.0
+        self.monaco_tokenization_time = 0.0
+        self.worker_time = 0.0
+        self.rounds = []                         # [(метка, длительность мс)]
+        self.workers = []                        # sessionId подключенных воркеров
+        self.replies = {}                        # id сообщения воркеру -> future ответа
+        self.message_ids = itertools.count(1)
+        self.recording = False
+        self.source_maps = {}                    # URL скрипта Monaco -> SourceMap или None
+        self.tokenization_frames = {}            # (url, строка, колонка) -> bool
+
+    async def attach(self):
+        self.cdp = await self.page.context.new_cdp_session(self.page)
+        await self.cdp.send("Profiler.enable")
+        await self.cdp.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+        # Воркеры: сессия Playwright не умеет адресовать дочерние сессии (flatten),
+        # поэтому команды им идут через Target.sendMessageToTarget
+        self.cdp.on("Target.attachedToTarget", self.on_attached)
+        self.cdp.on("Target.detachedFromTarget", self.on_detached)
+        self.cdp.on("Target.receivedMessageFromTarget", self.on_worker_message)
+        await self.cdp.send("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": False})
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def on_attached(self, event: dict):
+        if event["targetInfo"]["type"] == "worker":
+            asyncio.ensure_future(self.start_worker(event["sessionId"]))
+
+    def on_detached(self, event: dict):
+        if event["sessionId"] in self.workers:
+            self.workers.remove(event["sessionId"])
+
+    def on_worker_message(self, event: dict):
+        message = json.loads(event["message"])
+        reply = self.replies.pop(message.get("id"), None)
+        if reply is None or reply.done():
+            return
+        if "error" in message:
+            reply.set_exception(RuntimeError(message["error"].get("message")))
+        else:
+            reply.set_result(message.get("result", {}))
+
+    async def worker_send(self, session_id: str, method: str, params: dict = None) -> dict:
+        message_id = next(self.message_ids)
+        reply = asyncio.get_running_loop().create_future()
+        self.replies[message_id] = reply
+        await self.cdp.send("Target.sendMessageToTarget", {
+            "sessionId": session_id,
+            "message": json.dumps({"id": message_id, "method": method, "params": params or {}}),
+        })
+        return await reply
+
+    async def start_worker(self, session_id: str):
+        """Профилировщик в новом воркере; воркер, созданный посреди раунда, пишется с момента появления"""
+        try:
+            await self.worker_send(session_id, "Profiler.enable")
+            await self.worker_send(session_id, "Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+            self.workers.append(session_id)
+            if self.recording:
+                await self.worker_send(session_id, "Profiler.start")
+        except Exception as e:
+            print(f"⚠️  Воркер не профилируется: {e}")
+
+    async def stop_workers(self) -> list:
+        """Профили всех воркеров за раунд; завершившиеся воркеры пропускаются"""
+        profiles = []
+        for session_id in list(self.workers):
+            try:
+                profiles.append((await self.worker_send(session_id, "Profiler.stop"))["profile"])
+            except Exception:
+                continue
+        return profiles
+
+    @asynccontextmanager
+    async def round(self, label: str):
+        """Профилирует все, что происходит в странице и ее воркерах внутри блока with"""
+        if self.cdp is None:
+            await self.attach()
+        await self.cdp.send("Profiler.start")
+        for session_id in list(self.workers):
+            try:
+                await self.worker_send(session_id, "Profiler.start")
+            except Exception:
+                continue
+        self.recording = True
+        try:
+            yield
+        finally:
+            self.recording = False
+            profile = (await self.cdp.send("Profiler.stop"))["profile"]
+            worker_profiles = await self.stop_workers()
+            (self.out_dir / f"{label}.cpuprofile").write_text(json.dumps(profile), encoding="utf-8")
+            for n, worker_profile in enumerate(worker_profiles):
+                (self.out_dir / f"{label}.worker-{n}.cpuprofile").write_text(json.dumps(worker_profile), encoding="utf-8")
+            self.rounds.append((label, (profile["endTime"] - profile["startTime"]) / 1000))
+            for each in (profile, *worker_profiles):
+                await self.load_source_maps(each)
+            self.aggregate(profile)
+            for worker_profile in worker_profiles:
+                self.aggregate(worker_profile, root="(worker)")
+
+    async def load_source_maps(self, profile: dict):
+        """Загружает source map для скриптов Monaco из профиля (один раз на скрипт)"""
+        for node in profile["nodes"]:
+            url = node["callFrame"].get("url") or ""
+            if url in self.source_maps or "/min/vs/" not in url or not is_monaco(node["callFrame"]):
+                continue
+            self.source_maps[url] = None
+            try:
+                response = await self.page.context.request.get(source_map_url(url))
+                if response.ok:
+                    self.source_maps[url] = SourceMap(await response.json())
+            except Exception as e:
+                print(f"⚠️  Нет source map для {url}: {e}")
+
+    def is_tokenization(self, call_frame: dict) -> bool:
+        """Функция Monaco из модуля токенизации (по source map, иначе по URL скрипта)"""
+        url = call_frame.get("url") or ""
+        key = (url, call_frame["lineNumber"], call_frame["columnNumber"])
+        if key not in self.tokenization_frames:
+            source_map = self.source_maps.get(url)
+            source = source_map.source(call_frame["lineNumber"], call_frame["columnNumber"]) if source_map else None
+            self.tokenization_frames[key] = is_tokenization_module(source or url)
+        return self.tokenization_frames[key]
+
+    def aggregate(self, profile: dict, root: str = None):
+        """Складывает self-time узлов профиля и стеки для flamegraph"""
+        nodes = {node["id"]: node for node in profile["nodes"]}
+        parents = {}
+        for node in profile["nodes"]:
+            for child in node.get("children", []):
+                parents[child] = node["id"]
+
+        node_time = defaultdict(float)
+        # timeDeltas[i] — интервал перед samples[i]; время относим к узлу сэмпла
+        for node_id, delta in zip(profile["samples"], profile["timeDeltas"]):
+            node_time[node_id] += delta
+
+        for node_id, micros in node_time.items():
+            call_frame = nodes[node_id]["callFrame"]
+            if call_frame["functionName"] in IDLE_FRAMES:
+                continue
+            self.self_time[frame_name(call_frame)] += micros
+            self.function_time[call_frame["functionName"]] += micros
+            if root:
+                self.worker_time += micros
+            if is_monaco(call_frame):
+                self.monaco_time += micros
+                if self.is_tokenization(call_frame):
+                    self.monaco_tokenization_time += micros
+
+            stack = []
+            current = node_id
+            while current in nodes:
+                name = nodes[current]["callFrame"]["functionName"]
+                if name != "(root)":
+                    stack.append(frame_name(nodes[current]["callFrame"]).replace(";", ","))
+                current = parents.get(current)
+            if root:
+                stack.append(root)
+            self.collapsed[";".join(reversed(stack))] += micros
+
+    def write_summary(self, top: int = 20) -> Path:
+        """Печатает сводную таблицу и пишет collapsed.txt / summary.json"""
+        total = sum(self.self_time.values()) or 1.0
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        print("\n" + "="*60)
+        print(f"🔥 ПРОФИЛЬ РАУНДОВ ({len(self.rounds)} раундов)")
+        print("="*60)
+        print(f"{'self, мс':>10} {'доля':>7}  функция")
+        for name, micros in sorted(self.self_time.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"{micros / 1000:10.1f} {micros / total:7.1%}  {name}")
+
+        print("\nФункции игры:")
+        for name in WATCHED_FUNCTIONS:
+            micros = self.function_time.get(name, 0.0)
+            print(f"{micros / 1000:10.1f} {micros / total:7.1%}  {name}")
+        print(f"{self.monaco_tokenization_time / 1000:10.1f} {self.monaco_tokenization_time / total:7.1%}  Monaco: токенизация")
+        print(f"{self.monaco_time / 1000:10.1f} {self.monaco_time / total:7.1%}  Monaco: всего")
+        print(f"{self.worker_time / 1000:10.1f} {self.worker_time / total:7.1%}  Web Worker'ы (bugScorer и воркеры Monaco)")
+
+        with open(self.out_dir / "collapsed.txt", "w", encoding="utf-8") as f:
+            for stack, micros in sorted(self.collapsed.items()):
+                if stack and micros >= 1:
+                    f.write(f"{stack} {round(micros)}\n")
+        with open(self.out_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "rounds": [{"label": label, "duration_ms": round(ms, 2)} for label, ms in self.rounds],
+                "self_time_ms": {name: round(us / 1000, 3) for name, us in
+                                 sorted(self.self_time.items(), key=lambda kv: -kv[1])},
+                "monaco_ms": round(self.monaco_time / 1000, 3),
+                "monaco_tokenization_ms": round(self.monaco_tokenization_time / 1000, 3),
+                "worker_ms": round(self.worker_time / 1000, 3),
+            }, f, indent=2, ensure_ascii=False)
+
+        print(f"\n📁 Профили: {self.out_dir.relative_to(ROOT)}/ (*.cpuprofile, collapsed.txt, summary.json)")
+        return self.out_dir
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Хранилище скриншотов с перцептивными хэшами и визуальной регрессией
+- Скриншоты лежат в .screenshots/objects/ под именем sha256 содержимого,
+  одинаковые картинки хранятся один раз; снимок без проверки (save()),
+  перцептивно совпадающий с последним снимком того же имени, не сохраняется
+  заново. Снимок из check() сохраняется всегда: approve() должен утвердить
+  именно то, что проверка показала в отчете.
+- check() сравнивает снимок с утвержденным эталоном из baselines/<имя>.png
+  (NumPy: попиксельная разница и доля изменений по тайлам) и пишет
+  компактный отчет в .screenshots/report.json.
+
+    python3 screenshot_store.py report            последний отчет
+    python3 screenshot_store.py approve [ИМЯ...]  утвердить последние снимки как эталоны
+    python3 screenshot_store.py gc                удалить снимки, на которые ничего не ссылается
+
+Зависимости: pip install numpy pillow
+"""
+import argparse
+import hashlib
+import io
+import json
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+STORE_DIR = ROOT / ".screenshots"
+OBJECTS_DIR = STORE_DIR / "objects"
+INDEX_FILE = STORE_DIR / "index.json"
+REPORT_FILE = STORE_DIR / "report.json"
+BASELINE_DIR = ROOT / "baselines"
+
+PHASH_DUPLICATE_DISTANCE = 2   # бит из 64: ближе — считаем тем же кадром
+PIXEL_TOLERANCE = 24           # разница канала, которую не считаем изменением (сглаживание шрифтов)
+TILE = 32                      # сторона тайла для регионального диффа, px
+TILE_CHANGED = 0.02            # доля измененных пикселей, при которой тайл считается измененным
+MAX_CHANGED_RATIO = 0.002      # допустимая доля измененных пикселей во всем кадре
+
+
+def _numpy():
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError:
+        sys.exit("❌ Нужны numpy и Pillow: pip install numpy pillow")
+    return np, Image
+
+
+def decode(png: bytes):
+    """PNG -> массив (H, W, 3) uint8"""
+    np, Image = _numpy()
+    with Image.open(io.BytesIO(png)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def phash(pixels) -> int:
+    """64-битный pHash: DCT уменьшенного 32x32 серого кадра, знак относительно медианы"""
+    np, Image = _numpy()
+    gray = Image.fromarray(pixels).convert("L").resize((32, 32), Image.LANCZOS)
+    data = np.asarray(gray, dtype=np.float64)
+    n = np.arange(32)
+    dct = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / 64)
+    low = (dct @ data @ dct.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def diff(actual, baseline, tolerance: int = PIXEL_TOLERANCE, tile: int = TILE) -> dict:
+    """Попиксельное и потайловое сравнение двух кадров одного размера"""
+    np, _ = _numpy()
+    if actual.shape != baseline.shape:
+        return {"size_mismatch": [list(actual.shape[1::-1]), list(baseline.shape[1::-1])]}
+
+    changed = (np.abs(actual.astype(np.int16) - baseline.astype(np.int16)).max(axis=2) > tolerance)
+    h, w = changed.shape
+    result = {"changed_ratio": round(float(changed.mean()), 6), "bbox": None, "tiles": []}
+    if not changed.any():
+        return result
+
+    rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+    result["bbox"] = [int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1]
+
+    # доводим до кратного тайлу размера и считаем долю изменений в каждом тайле
+    padded = np.zeros((-(-h // tile) * tile, -(-w // tile) * tile), dtype=bool)
+    padded[:h, :w] = changed
+    per_tile = padded.reshape(padded.shape[0] // tile, tile, padded.shape[1] // tile, tile).mean(axis=(1, 3))
+    ty, tx = np.nonzero(per_tile > TILE_CHANGED)
+    order = np.argsort(-per_tile[ty, tx])[:10]
+    result["tiles_changed"] = int(len(ty))
+    result["tiles"] = [[int(tx[i]) * tile, int(ty[i]) * tile, round(float(per_tile[ty[i], tx[i]]), 3)] for i in order]
+    return result
+
+
+class ScreenshotStore:
+    def __init__(self):
+        self._index = None
+        self.report = []
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            if INDEX_FILE.exists():
+                self._index = json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+            else:
+                self._index = {"objects": {}, "latest": {}}
+        return self._index
+
+    def _flush_index(self):
+        STORE_DIR.mkdir(exist_ok=True)
+        INDEX_FILE.write_text(json.dumps(self.index, indent=1), encoding="utf-8")
+
+    def object_path(self, sha: str) -> Path:
+        return OBJECTS_DIR / sha[:2] / f"{sha}.png"
+
+    def save(self, name: str, png: bytes, pixels=None, dedupe: bool = True) -> str:
+        """Сохраняет снимок под логическим именем, возвращает sha сохраненного объекта
+
+        dedupe=False — не заменять снимок перцептивно похожим предыдущим
+        (check(): мелкое отличие от эталона должно попасть в хранилище).
+        """
+        sha = hashlib.sha256(png).hexdigest()
+        objects, latest = self.index["objects"], self.index["latest"]
+
+        if sha not in objects:
+            pixels = decode(png) if pixels is None else pixels
+            image_hash = phash(pixels)
+            previous = objects.get(latest.get(name))
+            if dedupe and previous and previous["size"] == list(pixels.shape[1::-1]) \
+                    and hamming(int(previous["phash"], 16), image_hash) <= PHASH_DUPLICATE_DISTANCE:
+                sha = latest[name]
+            else:
+                path = self.object_path(sha)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(png)
+                objects[sha] = {"phash": f"{image_hash:016x}", "size": list(pixels.shape[1::-1])}
+
+        latest[name] = sha
+        self._flush_index()
+        return sha
+
+    def check(self, name: str, png: bytes, max_changed: float = MAX_CHANGED_RATIO) -> bool:
+        """Сравнивает снимок с эталоном baselines/<name>.png и сохраняет его
+
+        Без эталона проверка считается пройденной (статус new) — снимок
+        утверждается командой approve.
+        """
+        pixels = decode(png)
+        baseline_path = BASELINE_DIR / f"{name}.png"
+        entry = {"name": name}
+        if baseline_path.exists():
+            entry.update(diff(pixels, decode(baseline_path.read_bytes())))
+            ok = "size_mismatch" not in entry and entry["changed_ratio"] <= max_changed
+            entry["status"] = "ok" if ok else "changed"
+        else:
+            entry["status"] = "new"
+            ok = True
+        # без pHash-дедупликации: approve() копирует latest[name], и это должен быть
+        # ровно этот снимок, даже если он отличается от прошлого на пару бит pHash
+        entry["sha"] = self.save(name, png, pixels, dedupe=False)
+        self.report.append(entry)
+
+        icon = {"ok": "✅", "changed": "❌", "new": "🆕"}[entry["status"]]
+        details = f" ({entry['changed_ratio']:.2%} пикселей)" if "changed_ratio" in entry else ""
+        print(f"{icon} Скриншот {name}: {entry['status']}{details}")
+        return ok
+
+    async def check_element(self, page, name: str, selector: str, mask=()) -> bool:
+        """check() для скриншота элемента Playwright-страницы; mask — селекторы
+        меняющихся от прогона к прогону значений (время, счетчики)"""
+        png = await page.locator(selector).screenshot(
+            animations="disabled", mask=[page.locator(m) for m in mask])
+        return self.check(name, png)
+
+    def write_report(self):
+        STORE_DIR.mkdir(exist_ok=True)
+        REPORT_FILE.write_text(json.dumps({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "results": self.report,
+        }, indent=1, ensure_ascii=False), encoding="utf-8")
+        print(f"📄 Отчет по скриншотам: {REPORT_FILE.relative_to(ROOT)}")
+
+    def approve(self, names=None) -> list:
+        """Делает последние снимки эталонами (все, если имена не заданы)"""
+        latest = self.index["latest"]
+        BASELINE_DIR.mkdir(exist_ok=True)
+        approved = []
+        for name in names or sorted(latest):
+            if name not in latest:
+                print(f"⚠️  Нет снимка {name}")
+                continue
+            shutil.copyfile(self.object_path(latest[name]), BASELINE_DIR / f"{name}.png")
+            approved.append(name)
+        return approved
+
+    def gc(self) -> int:
+        """Удаляет объекты, которые не являются последним снимком ни для одного имени"""
+        live = set(self.index["latest"].values())
+        removed = 0
+        for sha in list(self.index["objects"]):
+            if sha not in live:
+                self.object_path(sha).unlink(missing_ok=True)
+                del self.index["objects"][sha]
+                removed += 1
+        self._flush_index()
+        return removed
+
+
+def print_report():
+    if not REPORT_FILE.exists():
+        print("Отчета еще нет")
+        return True
+    report = json.loads(REPORT_FILE.read_text(encoding="utf-8"))
+    print(f"📸 Отчет от {report['created']}")
+    all_ok = True
+    for entry in report["results"]:
+        all_ok &= entry["status"] != "changed"
+        line = f"  {entry['status']:8} {entry['name']}"
+        if "size_mismatch" in entry:
+            line += f"  размер {entry['size_mismatch'][0]} вместо {entry['size_mismatch'][1]}"
+        elif entry.get("bbox"):
+            line += (f"  {entry['changed_ratio']:.2%} пикселей, область {entry['bbox']},"
+                     f" тайлов {entry['tiles_changed']}")
+        print(line)
+    return all_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Хранилище скриншотов и визуальная регрессия")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("report", help="последний отчет сравнения с эталонами")
+    approve = commands.add_parser("approve", help="утвердить последние снимки как эталоны")
+    approve.add_argument("names", nargs="*", help="имена снимков (по умолчанию все)")
+    commands.add_parser("gc", help="удалить неиспользуемые снимки")
+    args = parser.parse_args(argv)
+
+    store = ScreenshotStore()
+    if args.command == "report":
+        return 0 if print_report() else 1
+    if args.command == "approve":
+        for name in store.approve(args.names):
+            print(f"✅ Эталон обновлен: baselines/{name}.png")
+    elif args.command == "gc":
+        print(f"🧹 Удалено снимков: {store.gc()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
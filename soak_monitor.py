@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Мониторинг утечек памяти для длительного (soak) прогона игр
+Снимает через CDP размер JS-кучи (после принудительной сборки мусора),
+число DOM-узлов и обработчиков событий, а из страницы — число моделей
+Monaco и ожидающих таймеров gameClock. По каждой серии строится линейный
+тренд: стабильный рост на протяжении сотен раундов — признак утечки.
+"""
+from __future__ import annotations
+
+import statistics
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# метрика -> (подпись, минимальный рост за сегмент, который считаем утечкой)
+METRICS = {
+    "heap": ("JS heap, KB", 2048),
+    "nodes": ("DOM-узлы", 200),
+    "listeners": ("обработчики событий", 20),
+    "models": ("модели Monaco", 2),
+    "timers": ("таймеры gameClock", 5),
+}
+
+# доля шагов, на которых метрика не уменьшилась, чтобы рост считался монотонным
+MONOTONIC_SHARE = 0.7
+
+PAGE_COUNTERS_JS = """() => ({
+    models: typeof monaco !== 'undefined' ? monaco.editor.getModels().length : 0,
+    timers: typeof gameClock !== 'undefined' ? gameClock.pendingTimers() : 0
+})"""
+
+
+class LeakMonitor:
+    def __init__(self, page: Page):
+        self.page = page
+        self.cdp = None
+        self.segments = []  # [{"name": ..., "samples": [{"rounds": n, метрики...}]}]
+
+    async def attach(self):
+        """Открывает CDP-сессию; после навигации страницы вызывать заново не нужно"""
+        self.cdp = await self.page.context.new_cdp_session(self.page)
+        await self.cdp.send("Performance.enable")
+
+    def start_segment(self, name: str):
+        """Новая серия замеров — для каждой загрузки страницы своя"""
+        self.segments.append({"name": name, "samples": []})
+
+    async def sample(self, rounds: int) -> dict:
+        await self.cdp.send("HeapProfiler.collectGarbage")
+        metrics = {m["name"]: m["value"] for m in (await self.cdp.send("Performance.getMetrics"))["metrics"]}
+        counters = await self.page.evaluate(PAGE_COUNTERS_JS)
+        sample = {
+            "rounds": rounds,
+            "heap": round(metrics["JSHeapUsedSize"] / 1024),
+            "nodes": int(metrics["Nodes"]),
+            "listeners": int(metrics["JSEventListeners"]),
+            **counters,
+        }
+        self.segments[-1]["samples"].append(sample)
+        return sample
+
+    @staticmethod
+    def trend(samples, metric: str) -> dict:
+        """Линейный тренд метрики по числу сыгранных раундов"""
+        xs = [s["rounds"] for s in samples]
+        ys = [s[metric] for s in samples]
+        steps = [b - a for a, b in zip(ys, ys[1:])]
+        slope = statistics.linear_regression(xs, ys).slope if len(set(xs)) > 1 else 0.0
+        growth = ys[-1] - ys[0]
+        non_decreasing = sum(1 for d in steps if d >= 0) / len(steps) if steps else 0.0
+        leak = slope > 0 and growth >= METRICS[metric][1] and non_decreasing >= MONOTONIC_SHARE
+        return {"start": ys[0], "end": ys[-1], "per_100_rounds": round(slope * 100, 2), "leak": leak}
+
+    def analyze(self) -> list:
+        results = []
+        for segment in self.segments:
+            samples = segment["samples"]
+            if len(samples) < 3:
+                continue
+            results.append({
+                "name": segment["name"],
+                "rounds": samples[-1]["rounds"] - samples[0]["rounds"],
+                "trends": {metric: self.trend(samples, metric) for metric in METRICS},
+            })
+        return results
+
+    def print_report(self, results) -> bool:
+        print("\n" + "="*60)
+        print("🧪 SOAK: ТРЕНДЫ ПАМЯТИ")
+        print("="*60)
+        clean = True
+        for result in results:
+            print(f"\n📄 {result['name']} ({result['rounds']} раундов)")
+            for metric, t in result["trends"].items():
+                clean &= not t["leak"]
+                print(f"  {'❌' if t['leak'] else '✅'} {METRICS[metric][0]:22} "
+                      f"{t['start']:>8} → {t['end']:<8} ({t['per_100_rounds']:+} на 100 раундов)")
+        print("\n" + ("✅ Утечек не обнаружено" if clean else "⚠️  Есть монотонный рост — вероятная утечка"))
+        return clean
@@ -3,11 +3,17 @@
 Тестирование финальных экранов всех трёх игр
 """
 import asyncio
-import json
 from playwright.async_api import async_playwright
 
-with open("bugs-data.json", "r", encoding="utf-8") as f:
-    BUGS_DATA = json.load(f)
+from browser_profiles import launch, new_page
+from virtual_clock import with_virtual_time, with_sequential_order, wait_game_ready, advance
+from game_data import bugs_data
+from screenshot_store import ScreenshotStore
+
+# Меняющиеся от прогона к прогону значения на финальном экране
+FINAL_SCREEN_MASK = ["#finalTimeSpent"]
+
+SCREENSHOTS = ScreenshotStore()
 
 
 async def test_bug_hunter():
@@ -17,11 +23,11 @@ async def test_bug_hunter():
     print("="*60)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        browser = await launch(p, "full")
+        page = await new_page(browser, "full")
         page.on("dialog", lambda d: asyncio.create_task(d.accept()))
 
-        await page.goto("https://mws-code-game.website.yandexcloud.net/bug-hunter.html")
+        await page.goto(with_sequential_order("https://mws-code-game.website.yandexcloud.net/bug-hunter.html"))
         await page.wait_for_timeout(2000)
 
         await page.select_option("#languageSelector", value="javascript")
@@ -30,9 +36,9 @@ async def test_bug_hunter():
 
         # Пройти 2 раунда
         for i in range(2):
-            code = BUGS_DATA["javascript"][i]["fixedCode"]
+            code = bugs_data()["javascript"][i]["fixedCode"]
             escaped = code.replace('`', '\\`').replace('${', '\\${').replace('\\', '\\\\')
-            await page.evaluate(f"monaco.editor.getModels()[0].setValue(`{escaped}`);")
+            await page.evaluate(f"editor.getModel().setValue(`{escaped}`);")
             await page.wait_for_timeout(3000)
 
         await page.click("#finishBtn")
@@ -46,9 +52,10 @@ async def test_bug_hunter():
         print(f"✅ Раундов пройдено: {rounds}")
         print(f"✅ Цвет границы: {border}")
         print(f"{'✅' if 'rgb(139, 47, 201)' in border else '❌'} Соответствует фиолетовой теме")
+        visual_ok = await SCREENSHOTS.check_element(page, "final_bug_hunter", ".final-screen-content", FINAL_SCREEN_MASK)
 
         await browser.close()
-        return is_visible
+        return is_visible and visual_ok
 
 
 async def test_speed_typing():
@@ -58,8 +65,8 @@ async def test_speed_typing():
     print("="*60)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        browser = await launch(p, "full")
+        page = await new_page(browser, "full")
         page.on("dialog", lambda d: asyncio.create_task(d.accept()))
 
         await page.goto("https://mws-code-game.website.yandexcloud.net/speed-typing.html")
@@ -71,7 +78,7 @@ async def test_speed_typing():
 
         # Получить код для печати и ввести его
         target_code = await page.evaluate("currentTargetCode")
-        await page.evaluate(f"monaco.editor.getModels()[0].setValue(`{target_code}`);")
+        await page.evaluate(f"editor.getModel().setValue(`{target_code}`);")
         await page.wait_for_timeout(3000)
 
         # Завершить игру
@@ -87,6 +94,7 @@ async def test_speed_typing():
             print(f"✅ Раундов пройдено: {rounds}")
             print(f"✅ Цвет границы: {border}")
             print(f"{'✅' if 'rgb(255, 0, 50)' in border else '❌'} Соответствует красной теме")
+            is_visible = await SCREENSHOTS.check_element(page, "final_speed_typing", ".final-screen-content", FINAL_SCREEN_MASK)
         else:
             print(f"❌ Финальный экран НЕ виден!")
 
@@ -101,8 +109,8 @@ async def test_cloud_architect():
     print("="*60)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        browser = await launch(p, "full")
+        page = await new_page(browser, "full")
         page.on("dialog", lambda d: asyncio.create_task(d.accept()))
 
         await page.goto("https://mws-code-game.website.yandexcloud.net/cloud-architect.html")
@@ -124,6 +132,7 @@ async def test_cloud_architect():
             print(f"✅ Раундов пройдено: {rounds}")
             print(f"✅ Цвет границы: {border}")
             print(f"{'✅' if 'rgb(136, 136, 136)' in border else '⚠️'} Соответствует серой теме")
+            is_visible = await SCREENSHOTS.check_element(page, "final_cloud_architect", ".final-screen-content", FINAL_SCREEN_MASK)
         else:
             print(f"❌ Финальный экран НЕ виден!")
 
@@ -131,6 +140,35 @@ async def test_cloud_architect():
         return is_visible
 
 
+async def test_timer_expiry():
+    """Проверяет финальный экран по истечении таймера (виртуальное время)"""
+    print("\n" + "="*60)
+    print("⏱️ ИСТЕЧЕНИЕ ТАЙМЕРА (КОД-ХАНТИНГ)")
+    print("="*60)
+
+    async with async_playwright() as p:
+        browser = await launch(p, "fast")
+        page = await new_page(browser, "fast")
+
+        await page.goto(with_virtual_time("https://mws-code-game.website.yandexcloud.net/bug-hunter.html"))
+        await wait_game_ready(page)
+
+        await page.select_option("#languageSelector", value="javascript")
+        await page.click('button:has-text("Начать игру")')
+
+        # Проматываем все 3 минуты игры (+ один тик таймера)
+        await advance(page, 3 * 60 * 1000 + 100)
+
+        is_visible = await page.is_visible("#finalScreen")
+        time_spent = await page.text_content("#finalTimeSpent")
+
+        print(f"{'✅' if is_visible else '❌'} Финальный экран виден: {is_visible}")
+        print(f"{'✅' if time_spent == '3:00' else '❌'} Затрачено времени: {time_spent}")
+
+        await browser.close()
+        return is_visible and time_spent == "3:00"
+
+
 async def main():
     print("\n╔═══════════════════════════════════════════════════════════╗")
     print("║     Проверка финальных экранов всех игр                  ║")
@@ -139,13 +177,16 @@ async def main():
     results = {
         "Bug Hunter": await test_bug_hunter(),
         "Speed Typing": await test_speed_typing(),
-        "Cloud Architect": await test_cloud_architect()
+        "Cloud Architect": await test_cloud_architect(),
+        "Timer Expiry": await test_timer_expiry()
     }
 
     print("\n" + "="*60)
     print("📊 ИТОГОВЫЙ РЕЗУЛЬТАТ")
     print("="*60)
 
+    SCREENSHOTS.write_report()
+
     for game, success in results.items():
         status = "✅" if success else "❌"
         print(f"{status} {game}: {'Финальный экран работает' if success else 'ОШИБКА'}")
@@ -2,23 +2,32 @@
 """
 Автоматическое тестирование Bug Hunter для всех языков
 Проходит минимум 10 раундов на каждом языке, проверяя что игра работает
+Игра запускается в режиме виртуального времени: переходы между раундами
+проматываются через gameClock, а не ожидаются в реальном времени
 """
 
 import asyncio
 import json
+import time
 from playwright.async_api import async_playwright, Page
-from datetime import datetime
 
-
-# Загружаем реальные решения из извлеченного JSON
-with open("language_fixes.json", "r", encoding="utf-8") as f:
-    LANGUAGE_FIXES = json.load(f)
+from virtual_clock import with_virtual_time, with_sequential_order, wait_game_ready, advance, set_editor_value, ROUND_TRANSITION_MS
+from game_data import language_fixes
+from browser_profiles import launch, new_page
+from screenshot_store import ScreenshotStore
+from round_profiler import RoundProfiler, profile_round
+from results_history import ResultsHistory
 
 
 class BugHunterTester:
-    def __init__(self, url: str):
+    def __init__(self, url: str, profile: bool = False):
         self.url = url
         self.results = {}
+        self.screenshots = ScreenshotStore()
+        self.profile = profile
+        self.profiler = None
+        self.history = ResultsHistory()
+        self.run_id = None
 
     async def test_language(self, page: Page, language: str, language_value: str):
         """Тестирует один язык программирования"""
@@ -27,8 +36,8 @@ class BugHunterTester:
         print(f"{'='*60}")
 
         # Перезагружаем страницу для нового теста
-        await page.goto(self.url)
-        await page.wait_for_load_state("networkidle")
+        await page.goto(with_sequential_order(with_virtual_time(self.url)))
+        await wait_game_ready(page)
 
         # Выбираем язык
         await page.select_option("#languageSelector", value=language_value)
@@ -36,10 +45,9 @@ class BugHunterTester:
 
         # Начинаем игру
         await page.click('button:has-text("Начать игру")')
-        await page.wait_for_timeout(1000)
         print(f"✅ Игра началась")
 
-        fixes = LANGUAGE_FIXES.get(language, LANGUAGE_FIXES["javascript"])
+        fixes = language_fixes().get(language, language_fixes()["javascript"])
         rounds_completed = 0
         max_rounds = 10
         errors = []
@@ -61,27 +69,26 @@ class BugHunterTester:
                 fix_index = rounds_completed % len(fixes)
                 fixed_code = fixes[fix_index]
 
-                # Устанавливаем исправленный код
-                escaped_code = fixed_code.replace('`', '\\`').replace('${', '\\${').replace('\\', '\\\\')
-
-                await page.evaluate(f"""
-                    monaco.editor.getModels()[0].setValue(`{escaped_code}`);
-                """)
+                async with profile_round(self.profiler, f"{language}_round{rounds_completed + 1:02d}"):
+                    # Устанавливаем исправленный код
+                    # setValue синхронно триггерит checkCode() и roundComplete() через onDidChangeModelContent
+                    started = time.perf_counter()
+                    await set_editor_value(page, fixed_code)
 
-                # setValue автоматически триггерит checkCode() через onDidChangeModelContent
-                # Ждем короткую паузу для выполнения checkCode() и roundComplete()
-                await page.wait_for_timeout(500)
+                    # Читаем feedback ДО того как nextRound() очистит его (переход запланирован через gameClock)
+                    feedback = await page.text_content("#feedback")
+                    duration_ms = (time.perf_counter() - started) * 1000
 
-                # Читаем feedback ДО того как nextRound() очистит его (roundComplete делает setTimeout 2000ms)
-                feedback = await page.text_content("#feedback")
+                    # Проматываем переход к следующему раунду (nextRound() попадает в профиль раунда)
+                    await advance(page, ROUND_TRANSITION_MS)
 
                 success_keywords = ["МАСТЕР ДЕБАГА", "Баг найден", "Исправлено", "ОГОНЬ", "Быстро"]
-                if feedback and any(keyword in feedback for keyword in success_keywords):
+                success = bool(feedback and any(keyword in feedback for keyword in success_keywords))
+                self.history.record_round(self.run_id, language, rounds_completed + 1, bug_title,
+                                          duration_ms, feedback, success)
+                if success:
                     rounds_completed += 1
                     print(f"✅ Раунд {rounds_completed} пройден! {feedback}")
-
-                    # Ждем автоматического перехода к следующему раунду
-                    await page.wait_for_timeout(2500)
                 else:
                     print(f"❌ Валидация не прошла. Feedback: {feedback}")
                     errors.append(f"Round {rounds_completed + 1}: Validation failed - {feedback}")
@@ -91,10 +98,10 @@ class BugHunterTester:
                 error_msg = f"Round {rounds_completed + 1}: {str(e)}"
                 print(f"💥 Ошибка: {error_msg}")
                 errors.append(error_msg)
+                self.history.record_round(self.run_id, language, rounds_completed + 1, error=str(e))
 
                 # Делаем скриншот для отладки
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                await page.screenshot(path=f"error_{language}_{timestamp}.png")
+                self.screenshots.save(f"error_{language}", await page.screenshot())
                 break
 
         # Сохраняем результаты
@@ -124,13 +131,15 @@ class BugHunterTester:
         ]
 
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
+            browser = await launch(p, "fast")
+            page = await new_page(browser, "fast")
+            if self.profile:
+                self.profiler = RoundProfiler(page)
+            self.run_id = self.history.start_run("languages", self.url, browser.version)
 
             try:
                 for lang_name, lang_value in languages:
                     await self.test_language(page, lang_name, lang_value)
-                    await page.wait_for_timeout(2000)
 
                 # Финальный отчет
                 print(f"\n{'='*60}")
@@ -158,13 +167,17 @@ class BugHunterTester:
                     json.dump(self.results, f, indent=2, ensure_ascii=False)
                 print(f"\n📄 Отчет сохранен в test_results.json")
 
+                if self.profiler:
+                    self.profiler.write_summary()
+
             finally:
+                self.history.finish_run(self.run_id)
                 await browser.close()
 
 
-async def main():
+async def main(profile: bool = False):
     url = "https://mws-code-game.website.yandexcloud.net/bug-hunter.html"
-    tester = BugHunterTester(url)
+    tester = BugHunterTester(url, profile=profile)
     await tester.run_all_tests()
 
 
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 import asyncio
-import json
 from playwright.async_api import async_playwright
 
-with open("bugs-data.json", "r", encoding="utf-8") as f:
-    BUGS_DATA = json.load(f)
+from browser_profiles import launch, new_page
+from game_data import bugs_data, page_url
+from screenshot_store import ScreenshotStore
+from virtual_clock import with_sequential_order
+
 
 async def test():
-    url = "file:///Users/mikhailtrofimov/code/code-typing-game/bug-hunter.html"
+    url = with_sequential_order(page_url("bug-hunter.html", local=True))
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+        browser = await launch(p, "full", headless=False)
+        page = await new_page(browser, "full")
         page.on("dialog", lambda dialog: asyncio.create_task(dialog.accept()))
 
         await page.goto(url)
@@ -23,9 +25,9 @@ async def test():
 
         # Пройти 3 раунда
         for i in range(3):
-            code = BUGS_DATA["javascript"][i]["fixedCode"]
+            code = bugs_data()["javascript"][i]["fixedCode"]
             escaped = code.replace('`', '\\`').replace('${', '\\${').replace('\\', '\\\\')
-            await page.evaluate(f"monaco.editor.getModels()[0].setValue(`{escaped}`);")
+            await page.evaluate(f"editor.getModel().setValue(`{escaped}`);")
             await page.wait_for_timeout(3000)
 
         print("🎯 Нажимаем 'Завершить игру'...")
@@ -52,10 +54,13 @@ async def test():
             """)
             print(f"✅ Цвет границы: {border}")
 
-            await page.screenshot(path="final_screen_fixed.png")
-            print("✅ Скриншот: final_screen_fixed.png")
+            store = ScreenshotStore()
+            await store.check_element(page, "final_bug_hunter", ".final-screen-content", mask=["#finalTimeSpent"])
+            store.write_report()
 
         await page.wait_for_timeout(3000)
         await browser.close()
 
-asyncio.run(test())
+
+if __name__ == "__main__":
+    asyncio.run(test())
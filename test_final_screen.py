@@ -7,17 +7,17 @@
 3. Соответствие цветовой схеме игры (фиолетовый для Bug Hunter)
 """
 import asyncio
-import json
 from playwright.async_api import async_playwright, Page
 
-# Загружаем решения из bugs-data.json
-with open("bugs-data.json", "r", encoding="utf-8") as f:
-    BUGS_DATA = json.load(f)
+from browser_profiles import launch, new_page
+from game_data import bugs_data
+from screenshot_store import ScreenshotStore
+from virtual_clock import with_sequential_order
 
 
 async def test_final_screen():
     """Тестирует финальный экран после досрочного завершения игры"""
-    url = "https://mws-code-game.website.yandexcloud.net/bug-hunter.html"
+    url = with_sequential_order("https://mws-code-game.website.yandexcloud.net/bug-hunter.html")
     language = "javascript"
 
     print("\n" + "="*60)
@@ -25,8 +25,8 @@ async def test_final_screen():
     print("="*60)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+        browser = await launch(p, "full", headless=False)
+        page = await new_page(browser, "full")
 
         # Обработчик для confirm dialog
         page.on("dialog", lambda dialog: asyncio.create_task(dialog.accept()))
@@ -45,7 +45,7 @@ async def test_final_screen():
             await page.wait_for_timeout(1000)
             print(f"✅ Игра началась")
 
-            bugs = BUGS_DATA.get(language, [])
+            bugs = bugs_data().get(language, [])
             rounds_completed = 0
 
             # Проходим 3 раунда
@@ -58,7 +58,7 @@ async def test_final_screen():
 
                 # Устанавливаем правильный код
                 await page.evaluate(f"""
-                    monaco.editor.getModels()[0].setValue(`{escaped_code}`);
+                    editor.getModel().setValue(`{escaped_code}`);
                 """)
 
                 await page.wait_for_timeout(500)
@@ -121,9 +121,11 @@ async def test_final_screen():
                         else:
                             print(f"⚠️ Цвет границы не фиолетовый: {border_color}")
 
-                        # Делаем скриншот финального экрана
-                        await page.screenshot(path="final_screen_bug_hunter.png")
-                        print("✅ Скриншот сохранен: final_screen_bug_hunter.png")
+                        # Сравниваем финальный экран с эталоном
+                        store = ScreenshotStore()
+                        await store.check_element(page, "final_bug_hunter", ".final-screen-content",
+                                                  mask=["#finalTimeSpent"])
+                        store.write_report()
                     else:
                         print("❌ Финальный экран НЕ виден!")
 
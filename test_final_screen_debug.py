@@ -3,15 +3,16 @@
 Debug test для финального экрана
 """
 import asyncio
-import json
 from playwright.async_api import async_playwright, Page
 
-with open("bugs-data.json", "r", encoding="utf-8") as f:
-    BUGS_DATA = json.load(f)
+from browser_profiles import launch, new_page
+from game_data import bugs_data
+from screenshot_store import ScreenshotStore
+from virtual_clock import with_sequential_order
 
 
 async def test_final_screen_debug():
-    url = "https://mws-code-game.website.yandexcloud.net/bug-hunter.html"
+    url = with_sequential_order("https://mws-code-game.website.yandexcloud.net/bug-hunter.html")
     language = "javascript"
 
     print("\n" + "="*60)
@@ -19,8 +20,8 @@ async def test_final_screen_debug():
     print("="*60)
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+        browser = await launch(p, "full", headless=False)
+        page = await new_page(browser, "full")
 
         # Обработчик для dialog с логированием
         async def handle_dialog(dialog):
@@ -46,14 +47,14 @@ async def test_final_screen_debug():
             print(f"✅ Игра началась")
 
             # Проходим 3 раунда
-            bugs = BUGS_DATA.get(language, [])
+            bugs = bugs_data().get(language, [])
             for round_num in range(3):
                 bug_index = round_num % len(bugs)
                 fixed_code = bugs[bug_index]["fixedCode"]
                 escaped_code = fixed_code.replace('`', '\\`').replace('${', '\\${').replace('\\', '\\\\')
 
                 await page.evaluate(f"""
-                    monaco.editor.getModels()[0].setValue(`{escaped_code}`);
+                    editor.getModel().setValue(`{escaped_code}`);
                 """)
                 await page.wait_for_timeout(500)
                 feedback = await page.text_content("#feedback")
@@ -113,8 +114,8 @@ async def test_final_screen_debug():
                 print(f"   Заголовок: {title_text}")
 
                 # Скриншот
-                await page.screenshot(path="final_screen_manual.png")
-                print("   Скриншот: final_screen_manual.png")
+                sha = ScreenshotStore().save("final_screen_manual", await page.screenshot())
+                print(f"   Скриншот: final_screen_manual ({sha[:12]})")
 
             await page.wait_for_timeout(3000)
 
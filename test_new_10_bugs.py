@@ -5,19 +5,22 @@
 """
 import asyncio
 import json
+import time
 from playwright.async_api import async_playwright, Page
 from datetime import datetime
 
-
-# Загружаем решения из bugs-data.json
-with open("bugs-data.json", "r", encoding="utf-8") as f:
-    BUGS_DATA = json.load(f)
+from browser_profiles import launch, new_page
+from game_data import bugs_data
+from virtual_clock import with_sequential_order, set_editor_value
+from results_history import ResultsHistory
 
 
 class BugHunterTester:
     def __init__(self, url: str):
         self.url = url
         self.results = {}
+        self.history = ResultsHistory()
+        self.run_id = None
 
     async def test_language(self, page: Page, language: str):
         """Тестирует один язык"""
@@ -25,7 +28,7 @@ class BugHunterTester:
         print(f"🧪 Тестирование: {language.upper()}")
         print(f"{'='*60}")
 
-        await page.goto(self.url)
+        await page.goto(with_sequential_order(self.url))
         await page.wait_for_load_state("networkidle")
         
         # Ждем загрузки bugs-data.json
@@ -38,7 +41,7 @@ class BugHunterTester:
         await page.wait_for_timeout(1000)
         print(f"✅ Игра началась")
 
-        bugs = BUGS_DATA.get(language, [])
+        bugs = bugs_data().get(language, [])
         rounds_completed = 0
         max_rounds = 10
         errors = []
@@ -59,21 +62,21 @@ class BugHunterTester:
                 bug_index = round_num % len(bugs)
                 fixed_code = bugs[bug_index]["fixedCode"]
 
-                # Устанавливаем код
-                escaped_code = fixed_code.replace('`', '\\`').replace('${', '\\${').replace('\\', '\\\\')
-                
-                await page.evaluate(f"""
-                    monaco.editor.getModels()[0].setValue(`{escaped_code}`);
-                """)
-
-                # setValue автоматически триггерит checkCode()
-                await page.wait_for_timeout(500)
+                # Устанавливаем код: setValue триггерит checkCode(), set_editor_value дожидается
+                # проверки в воркере и фидбека в DOM — время раунда без фиксированных пауз,
+                # как в наборе languages
+                started = time.perf_counter()
+                await set_editor_value(page, fixed_code)
 
                 # Читаем feedback ДО nextRound()
                 feedback = await page.text_content("#feedback")
+                duration_ms = (time.perf_counter() - started) * 1000
 
                 success_keywords = ["МАСТЕР ДЕБАГА", "Баг найден", "Исправлено", "ОГОНЬ", "Быстро"]
-                if feedback and any(keyword in feedback for keyword in success_keywords):
+                success = bool(feedback and any(keyword in feedback for keyword in success_keywords))
+                self.history.record_round(self.run_id, language, round_num + 1, bug_title,
+                                          duration_ms, feedback, success)
+                if success:
                     rounds_completed += 1
                     print(f"✅ Раунд {rounds_completed} пройден! {feedback}")
                     await page.wait_for_timeout(2500)
@@ -86,6 +89,7 @@ class BugHunterTester:
                 error_msg = f"Round {round_num + 1}: {str(e)}"
                 print(f"💥 Ошибка: {error_msg}")
                 errors.append(error_msg)
+                self.history.record_round(self.run_id, language, round_num + 1, error=str(e))
                 break
 
         self.results[language] = {
@@ -107,8 +111,9 @@ class BugHunterTester:
         languages = ["javascript", "python", "cpp", "csharp", "java"]
 
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
+            browser = await launch(p, "fast")
+            page = await new_page(browser, "fast")
+            self.run_id = self.history.start_run("new-bugs", self.url, browser.version)
 
             try:
                 for lang in languages:
@@ -141,6 +146,7 @@ class BugHunterTester:
                 print(f"\n📄 Отчет сохранен в test_results_new.json")
 
             finally:
+                self.history.finish_run(self.run_id)
                 await browser.close()
 
 
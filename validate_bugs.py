@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Проверка каталога багов bugs-data.json локальными компиляторами
+Для каждого сценария:
+  - fixedCode должен проходить проверку синтаксиса своего языка
+  - buggyCode должен отличаться от fixedCode (без учета пробелов, как в игре)
+  - для buggyCode в отчет пишется, компилируется ли он (информативно)
+Проверки идут параллельно в пуле процессов, результаты кэшируются по хэшу
+содержимого в .validate_cache.json — неизмененные сценарии не перепроверяются.
+Языки, для которых нет компилятора, помечаются как пропущенные.
+"""
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+BUGS_DATA = ROOT / "bugs-data.json"
+CACHE_FILE = ROOT / ".validate_cache.json"
+
+CHECK_TIMEOUT = 60  # секунд на один вызов компилятора
+
+
+def _java_file_name(code: str) -> str:
+    match = re.search(r"public\s+(?:final\s+)?class\s+(\w+)", code)
+    return f"{match.group(1) if match else 'Main'}.java"
+
+
+# язык -> (исполняемый файл, имя файла исходника, команда проверки)
+TOOLCHAINS = {
+    "python": (sys.executable, lambda code: "snippet.py",
+               lambda path, out: [sys.executable, "-m", "py_compile", str(path)]),
+    "javascript": ("node", lambda code: "snippet.js",
+                   lambda path, out: ["node", "--check", str(path)]),
+    "cpp": ("g++", lambda code: "snippet.cpp",
+            lambda path, out: ["g++", "-std=c++17", "-fsyntax-only", str(path)]),
+    "java": ("javac", _java_file_name,
+             lambda path, out: ["javac", "-d", str(out), str(path)]),
+    "csharp": ("mcs", lambda code: "snippet.cs",
+               lambda path, out: ["mcs", "--parse", str(path)]),
+    "golang": ("gofmt", lambda code: "snippet.go",
+               lambda path, out: ["gofmt", "-e", "-l", str(path)]),
+}
+
+
+def normalize(code: str) -> str:
+    """Сравнение как в bug-hunt режиме игры: без пробельных символов"""
+    return re.sub(r"\s+", "", code)
+
+
+def cache_key(language: str, code: str) -> str:
+    tool = TOOLCHAINS[language][0]
+    return hashlib.sha256(f"{language}\0{tool}\0{code}".encode("utf-8")).hexdigest()
+
+
+def check_source(language: str, code: str) -> dict:
+    """Прогоняет один исходник через компилятор (выполняется в пуле процессов)"""
+    tool, file_name, command = TOOLCHAINS[language]
+    with tempfile.TemporaryDirectory(prefix=f"validate_{language}_") as tmp:
+        tmp_dir = Path(tmp)
+        source = tmp_dir / file_name(code)
+        source.write_text(code, encoding="utf-8")
+        try:
+            proc = subprocess.run(
+                command(source, tmp_dir),
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            return {"ok": False, "output": f"{tool}: timeout {CHECK_TIMEOUT}s"}
+        output = (proc.stderr or proc.stdout).replace(str(tmp_dir) + "/", "")
+        return {"ok": proc.returncode == 0, "output": output.strip()[:2000]}
+
+
+def load_cache() -> dict:
+    if CACHE_FILE.exists():
+        try:
+            return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
+def validate(languages=None, jobs=None, use_cache=True) -> dict:
+    """Проверяет каталог, возвращает отчет {язык: {...}}"""
+    with open(BUGS_DATA, "r", encoding="utf-8") as f:
+        catalogue = json.load(f)
+
+    cache = load_cache() if use_cache else {}
+    available = {lang: shutil.which(tool[0]) is not None for lang, tool in TOOLCHAINS.items()}
+
+    report = {}
+    pending = {}  # cache_key -> (language, code)
+    for language, scenarios in catalogue.items():
+        if languages and language not in languages:
+            continue
+        lang_report = report[language] = {
+            "toolchain": TOOLCHAINS[language][0] if language in TOOLCHAINS else None,
+            "available": available.get(language, False),
+            "scenarios": [],
+        }
+        for index, scenario in enumerate(scenarios):
+            entry = {"index": index, "description": scenario["description"], "problems": []}
+            if normalize(scenario["buggyCode"]) == normalize(scenario["fixedCode"]):
+                entry["problems"].append("buggyCode совпадает с fixedCode (без учета пробелов)")
+            for field in ("fixedCode", "buggyCode"):
+                key = cache_key(language, scenario[field]) if language in TOOLCHAINS else None
+                entry[field] = key
+                if key and lang_report["available"] and key not in cache:
+                    pending[key] = (language, scenario[field])
+            lang_report["scenarios"].append(entry)
+
+    cached_hits = sum(
+        1 for lang in report.values() for s in lang["scenarios"]
+        for field in ("fixedCode", "buggyCode") if s[field] in cache
+    )
+    if pending:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {key: pool.submit(check_source, *args) for key, args in pending.items()}
+            for key, future in futures.items():
+                cache[key] = future.result()
+        if use_cache:
+            CACHE_FILE.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+
+    for lang_report in report.values():
+        for entry in lang_report["scenarios"]:
+            for field in ("fixedCode", "buggyCode"):
+                result = cache.get(entry[field]) if lang_report["available"] else None
+                entry[field] = result
+            fixed = entry["fixedCode"]
+            if fixed is not None and not fixed["ok"]:
+                entry["problems"].append(f"fixedCode не компилируется:\n{fixed['output']}")
+
+    report["_stats"] = {"checked": len(pending), "cached": cached_hits}
+    return report
+
+
+def print_report(report: dict) -> bool:
+    stats = report.pop("_stats")
+    all_ok = True
+    for language, lang_report in report.items():
+        scenarios = lang_report["scenarios"]
+        broken = [s for s in scenarios if s["problems"]]
+        if not lang_report["available"]:
+            status = f"⏭️  нет {lang_report['toolchain']}, только проверка отличий"
+        else:
+            buggy_fail = sum(1 for s in scenarios if s["buggyCode"] and not s["buggyCode"]["ok"])
+            status = f"buggyCode с ошибкой компиляции: {buggy_fail}/{len(scenarios)}"
+        print(f"{'✅' if not broken else '❌'} {language.upper()}: {len(scenarios) - len(broken)}/{len(scenarios)} ок ({status})")
+        for entry in broken:
+            all_ok = False
+            print(f"    #{entry['index']} {entry['description']}")
+            for problem in entry["problems"]:
+                print("      " + problem.replace("\n", "\n      "))
+    print(f"\n📊 Проверено компилятором: {stats['checked']}, из кэша: {stats['cached']}")
+    return all_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверка bugs-data.json компиляторами")
+    parser.add_argument("--language", action="append", help="проверить только этот язык (можно несколько)")
+    parser.add_argument("--jobs", type=int, default=None, help="число процессов (по умолчанию — по числу CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="не использовать и не обновлять кэш")
+    args = parser.parse_args(argv)
+
+    report = validate(args.language, args.jobs, use_cache=not args.no_cache)
+    return 0 if print_report(report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Виртуальное время для автотестов игр
+Страница, открытая с ?virtualTime=1, переводит gameClock в ручной режим:
+таймеры (переход между раундами, автопереход архитектора, обратный отсчёт)
+срабатывают только при вызове advance(), поэтому тестам не нужно ждать
+реальные секунды.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+VIRTUAL_TIME_PARAM = "virtualTime=1"
+# Тесты берут решения из каталога по номеру раунда, поэтому отключают перемешивание
+SEQUENTIAL_ORDER_PARAM = "order=sequence"
+
+# Задержки из кода игр (мс)
+ROUND_TRANSITION_MS = 2000      # roundComplete() -> nextRound()
+ARCHITECT_AUTO_ADVANCE_MS = 1500  # validateRealTime() -> architectLevelComplete()
+
+
+def with_param(url: str, param: str) -> str:
+    """Добавляет к URL параметр вида name=value"""
+    parts = urlsplit(url)
+    query = f"{parts.query}&{param}" if parts.query else param
+    return urlunsplit(parts._replace(query=query))
+
+
+def with_virtual_time(url: str) -> str:
+    """Добавляет к URL параметр включения виртуального времени"""
+    return with_param(url, VIRTUAL_TIME_PARAM)
+
+
+def with_sequential_order(url: str) -> str:
+    """Раунды в порядке каталога (bugs-data.json, codeSnippets) вместо перемешивания"""
+    return with_param(url, SEQUENTIAL_ORDER_PARAM)
+
+
+async def wait_game_ready(page: Page, timeout: int = 30000):
+    """Ждет загрузки Monaco и данных игры (и корпуса сниппетов в Speed Typing) вместо фиксированных пауз"""
+    await page.wait_for_function(
+        """() => typeof monaco !== 'undefined'
+            && typeof editor !== 'undefined' && !!editor
+            && Object.keys(bugScenariosByLanguage).length > 0
+            && (typeof snippetCorpus === 'undefined' || snippetCorpus.settled)""",
+        timeout=timeout,
+    )
+
+
+async def advance(page: Page, ms: int) -> float:
+    """Сдвигает игровое время на ms миллисекунд, возвращает текущее игровое время"""
+    return await page.evaluate("ms => gameClock.advance(ms)", ms)
+
+
+async def set_editor_value(page: Page, code: str):
+    """Устанавливает код в редактор (setValue синхронно вызывает checkCode)
+
+    В bug-hunt режиме результат приходит из воркера, а фидбек пишется в DOM
+    раз в кадр, поэтому дожидаемся ответа и сбрасываем фидбек в DOM, чтобы
+    следующий text_content("#feedback") увидел результат проверки.
+    """
+    await page.evaluate(
+        """async code => {
+            editor.getModel().setValue(code);
+            await bugScorer.settled();
+            gameView.flush();
+        }""",
+        code,
+    )